@@ -0,0 +1,165 @@
+"""Timed phase loops shared by the root test_sqlite / test_pgsqlite_* overhead scripts."""
+import functools
+import gc
+import socket
+import sys
+import time
+
+import numpy as np
+
+# Clock for every timed span: on Linux CLOCK_MONOTONIC_RAW, which NTP cannot slew
+# (perf_counter uses CLOCK_MONOTONIC); partial() keeps the call in C
+if sys.platform.startswith("linux") and hasattr(time, "CLOCK_MONOTONIC_RAW"):
+    clock_ns = functools.partial(time.clock_gettime_ns, time.CLOCK_MONOTONIC_RAW)
+else:
+    clock_ns = time.perf_counter_ns
+
+# Workload shared by every script, built once at import so no phase (or
+# script) re-formats the same strings inside its timings
+ITERATIONS = 100
+VALUES = list(range(ITERATIONS))
+NAMES = [f"item{i}" for i in VALUES]
+INSERT_PARAMS = list(zip(NAMES, VALUES))
+SELECT_PARAMS = [(value // 2,) for value in VALUES]
+
+
+# Where test_sqlite.py keeps its database for each --backend; run_overhead_tests.sh
+# starts pgsqlite on the same store so both sides pay the same storage costs. The
+# files differ from pgsqlite's test_overhead.db so the two never share locks or
+# journal modes, even with --parallel
+BACKENDS = {
+    "mem": ":memory:",
+    "tmpfs": "/dev/shm/test_overhead_sqlite.db",
+    "disk": "test_overhead_sqlite.db",
+}
+
+
+def sqlite_backend(argv):
+    """Backend chosen with --backend {mem,tmpfs,disk}; defaults to disk."""
+    if "--backend" not in argv:
+        return "disk"
+    index = argv.index("--backend") + 1
+    backend = argv[index] if index < len(argv) else None
+    if backend not in BACKENDS:
+        raise SystemExit(f"--backend must be one of: {', '.join(BACKENDS)}")
+    return backend
+
+
+def pgsqlite_conninfo(argv):
+    """Connection string for the local pgsqlite server on port 45000.
+
+    pgsqlite always listens on a Unix socket in /tmp as well as TCP, so the
+    socket is used by default; pass --tcp to go through localhost instead
+    (libpq already sets TCP_NODELAY and the server does the same).
+    """
+    host = "localhost" if "--tcp" in argv else "/tmp"
+    return f"host={host} port=45000 dbname=test_overhead.db user=dummy password=dummy sslmode=disable"
+
+
+def check_transport(conn, argv, buffer_size=1 << 20):
+    """Fail unless the connection uses the transport asked for, then size its socket buffers.
+
+    libpq silently falls back to whatever host it was given, so confirm the
+    socket really is AF_UNIX (or TCP with --tcp) before timing anything.
+    """
+    # fromfd() dups the descriptor; options set on the dup apply to libpq's socket
+    with socket.fromfd(conn.fileno(), socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        if hasattr(socket, "SO_DOMAIN"):
+            is_unix = sock.getsockopt(socket.SOL_SOCKET, socket.SO_DOMAIN) == socket.AF_UNIX
+        else:
+            # No SO_DOMAIN (e.g. macOS): Unix socket names are str, INET ones tuples
+            is_unix = isinstance(sock.getsockname(), (str, bytes))
+        want_unix = "--tcp" not in argv
+        if is_unix != want_unix:
+            raise SystemExit(f"pgsqlite connection is {'AF_UNIX' if is_unix else 'TCP'} "
+                             f"(host {conn.info.host}), expected {'AF_UNIX' if want_unix else 'TCP'}")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_size)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size)
+
+
+def warm_up(cursor, count=20):
+    """Run a few SELECT 1 round trips so connection start-up costs stay out of the timings."""
+    for _ in range(count):
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+
+
+def _drain(cursor):
+    """Consume a result row by row without building the fetchall() list."""
+    for _ in cursor:
+        pass
+
+
+def run_phase(cursor, sql, params, do_fetch=False, stream=False, **kwargs):
+    """Execute sql once per parameter row and return each op's latency in ns.
+
+    With stream=True fetched rows are iterated one at a time instead of
+    collected with fetchall(), for phases returning many rows per execute.
+    The cyclic GC is paused for the loop so collections triggered by fetched
+    rows do not land in individual samples; garbage is collected afterwards.
+    """
+    exec_ = cursor.execute
+    fetch = (lambda: _drain(cursor)) if stream else cursor.fetchall
+    pc = clock_ns
+    times = np.empty(len(params), dtype=np.int64)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i, row in enumerate(params):
+            start = pc()
+            exec_(sql, row, **kwargs)
+            if do_fetch:
+                fetch()
+            times[i] = pc() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+    gc.collect()
+    return times
+
+
+def run_phase_pipelined(cursor, sql, params, do_fetch=False):
+    """Send every row in one pipelined psycopg3 executemany; each op gets an equal ns share."""
+    pc = clock_ns
+    start = pc()
+    with cursor.connection.pipeline():
+        cursor.executemany(sql, params, returning=do_fetch)
+    if do_fetch:
+        cursor.fetchall()
+        while cursor.nextset():
+            cursor.fetchall()
+    return np.full(len(params), (pc() - start) // len(params), dtype=np.int64)
+
+
+def bulk_insert_ms(cursor, table, names, values):
+    """Load the name/value columns with one multi-row INSERT and return ms per row.
+
+    pgsqlite has no COPY, so this single statement is its bulk-load path.
+    """
+    count = len(names)
+    sql = f"INSERT INTO {table} (name, value) VALUES " + ", ".join(["(%s, %s)"] * count)
+    # Interleave the columns straight into the flat parameter list, no per-row tuples
+    params = [None] * (2 * count)
+    params[0::2] = names
+    params[1::2] = values
+    start = clock_ns()
+    cursor.execute(sql, params)
+    return (clock_ns() - start) / count / 1e6
+
+
+def round_trip_floor_ms(cursor, count=100):
+    """Median latency of a bare SELECT 1, i.e. the driver + protocol cost with no real query work."""
+    times = run_phase(cursor, "SELECT 1", [()] * count, do_fetch=True)
+    return float(np.median(times)) / 1e6
+
+
+def latency_ms(times, trim=0.05):
+    """Trimmed mean, p50 and p99 of ns latencies, in ms.
+
+    The mean drops the fastest and slowest `trim` fraction of samples so a
+    few stray outliers do not dominate it; the percentiles use every sample.
+    """
+    p50, p99 = np.percentile(times, [50, 99])
+    cut = int(len(times) * trim)
+    trimmed = np.sort(times)[cut:len(times) - cut]
+    return trimmed.mean() / 1e6, p50 / 1e6, p99 / 1e6
@@ -120,10 +120,10 @@ class BenchmarkRunner:
     
     def measure_time(self, func, *args, **kwargs) -> float:
         """Measure execution time of a function"""
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end = time.perf_counter()
-        return end - start, result
+        end = time.perf_counter_ns()
+        return (end - start) / 1e9, result
     
     def execute_query(self, cursor, query, params=None):
         """Execute a query with optional binary mode for psycopg3."""
@@ -6,19 +6,77 @@ Tests the performance impact of array binary encoding/decoding.
 
 import sqlite3
 import time
-import random
+import array
+import csv
 import json
 import statistics
-from dataclasses import dataclass
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from dataclasses import dataclass, asdict, fields
 from typing import List, Dict, Any, Tuple
 from tabulate import tabulate
 from colorama import init, Fore, Style
 import os
 import sys
 
+# Prefer orjson for serializing array columns, fall back to the stdlib encoder
+try:
+    import orjson
+
+    def json_dumps(value: Any) -> str:
+        return orjson.dumps(value).decode()
+except ImportError:
+    # Bound encoder method skips json.dumps' per-call argument handling
+    json_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
 # Initialize colorama
 init()
 
+
+def encode_int_array(values: List[int]) -> bytes:
+    """Pack an integer array as raw int64 bytes"""
+    return array.array('q', values).tobytes()
+
+
+def encode_float_array(values: List[float]) -> bytes:
+    """Pack a float array as raw float64 bytes"""
+    return array.array('d', values).tobytes()
+
+
+def decode_int_array(blob: bytes) -> List[int]:
+    values = array.array('q')
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def decode_float_array(blob: bytes) -> List[float]:
+    values = array.array('d')
+    values.frombytes(blob)
+    return values.tolist()
+
+
+# Overhead cell colors, resolved once
+_GREEN, _YELLOW, _RED, _RESET = Fore.GREEN, Fore.YELLOW, Fore.RED, Style.RESET_ALL
+
+# Operations that report a per-row average over one bulk call
+BULK_OPERATIONS = {"BATCH_INSERT", "BULK_INSERT", "INSERT_PIPELINE"}
+
+# SQLite-only variants, compared against the pgsqlite operation they mirror
+SQLITE_VARIANTS = {"INSERT_BLOB": "INSERT", "SELECT_BLOB": "SELECT"}
+
+# pgsqlite-only variants, compared against the SQLite operation they mirror
+PGSQLITE_VARIANTS = {"INSERT_PIPELINE": "BATCH_INSERT"}
+
+ARRAY_COLUMNS = ("int_array", "bigint_array", "text_array", "float_array", "bool_array")
+
+# pgsqlite statements, reused verbatim so every execution hits the same prepared statement
+PG_INSERT_SQL = """INSERT INTO {table}
+    (id, int_array, bigint_array, text_array, float_array, bool_array)
+    VALUES (%s, %s, %s, %s, %s, %s)"""
+PG_SELECT_SQL = "SELECT int_array, text_array, float_array FROM {table} WHERE id = %s"
+PG_UPDATE_SQL = "UPDATE {table} SET int_array = %s WHERE id = %s"
+
 @dataclass
 class ArrayBenchmarkResult:
     operation: str
@@ -27,12 +85,26 @@ class ArrayBenchmarkResult:
     sqlite_time: float
     pgsqlite_time: float
     overhead_factor: float
+    sqlite_median: float = 0.0
+    pgsqlite_median: float = 0.0
+    sqlite_p95: float = 0.0
+    pgsqlite_p95: float = 0.0
 
 class ArrayBenchmarkRunner:
-    def __init__(self, iterations: int = 100, port: int = 15500):
+    def __init__(self, iterations: int = 100, port: int = 15500, trace_memory: bool = False,
+                 sqlite_mode: str = "file", parallel: bool = False, output_format: str = "table",
+                 output_file: str = None):
         self.iterations = iterations
         self.port = port
+        self.trace_memory = trace_memory
+        self.sqlite_mode = sqlite_mode
+        self.parallel = parallel
+        self.output_format = output_format
+        self.output_file = output_file
         self.sqlite_file = "array_benchmark_test.db"
+        self.rng = np.random.default_rng()
+        # "text_{i}_" prefixes per array size, built once and reused for every row
+        self._text_prefixes: Dict[int, List[str]] = {}
 
         # Import psycopg3
         try:
@@ -43,6 +115,8 @@ class ArrayBenchmarkRunner:
             sys.exit(1)
 
         self.results: List[ArrayBenchmarkResult] = []
+        # Pre-generated rows per array size, shared by the SQLite and pgsqlite runs
+        self._precomputed: Dict[int, List[Dict[str, Any]]] = {}
 
     def setup(self):
         """Remove existing database file if it exists"""
@@ -54,38 +128,109 @@ class ArrayBenchmarkRunner:
         if os.path.exists(self.sqlite_file):
             os.remove(self.sqlite_file)
 
+    def generate_int_array(self, size: int) -> List[int]:
+        """Generate only an int array (all the UPDATE benchmark rewrites)"""
+        return self.rng.integers(1, 1001, size).tolist()
+
     def generate_test_arrays(self, size: int) -> Dict[str, Any]:
         """Generate test arrays of different types and sizes"""
+        rng = self.rng
+        prefixes = self._text_prefixes.get(size)
+        if prefixes is None:
+            prefixes = self._text_prefixes[size] = [f"text_{i}_" for i in range(size)]
         return {
-            "int_array": [random.randint(1, 1000) for _ in range(size)],
-            "bigint_array": [random.randint(1000000000000, 9999999999999) for _ in range(size)],
-            "text_array": [f"text_{i}_{random.randint(1000, 9999)}" for i in range(size)],
-            "float_array": [round(random.uniform(0.0, 1000.0), 3) for _ in range(size)],
-            "bool_array": [random.choice([True, False]) for _ in range(size)]
+            "int_array": self.generate_int_array(size),
+            "bigint_array": rng.integers(1000000000000, 10000000000000, size).tolist(),
+            "text_array": [prefix + str(n) for prefix, n in
+                           zip(prefixes, rng.integers(1000, 10000, size).tolist())],
+            "float_array": rng.uniform(0.0, 1000.0, size).round(3).tolist(),
+            "bool_array": rng.integers(0, 2, size, dtype=bool).tolist()
         }
 
-    def measure_time(self, func, *args, **kwargs) -> float:
-        """Measure execution time of a function"""
-        start = time.perf_counter()
+    def prepare_dataset(self, array_size: int) -> List[Dict[str, Any]]:
+        """Generate one row of test arrays per iteration, with JSON pre-serialized"""
+        dataset = []
+        for _ in range(self.iterations):
+            data = self.generate_test_arrays(array_size)
+            for column in ARRAY_COLUMNS:
+                data[f"_json_{column}"] = json_dumps(data[column])
+            data["_blob_int_array"] = encode_int_array(data["int_array"])
+            data["_blob_float_array"] = encode_float_array(data["float_array"])
+            # Replacement int_array for the UPDATE benchmark, serialized up front
+            data["_update_int_array"] = self.generate_int_array(array_size)
+            data["_json_update_int_array"] = json_dumps(data["_update_int_array"])
+            dataset.append(data)
+        return dataset
+
+    def sqlite_row(self, row_id: int, data: Dict[str, Any]) -> Tuple:
+        """Build an INSERT parameter tuple for SQLite (arrays stored as JSON text)"""
+        return (row_id,) + tuple(data[f"_json_{column}"] for column in ARRAY_COLUMNS)
+
+    def sqlite_blob_row(self, row_id: int, data: Dict[str, Any]) -> Tuple:
+        """Build an INSERT parameter tuple for SQLite with numeric arrays packed as BLOBs"""
+        return (row_id, data["_blob_int_array"], data["_json_bigint_array"], data["_json_text_array"],
+                data["_blob_float_array"], data["_json_bool_array"])
+
+    def pgsqlite_row(self, row_id: int, data: Dict[str, Any]) -> Tuple:
+        """Build an INSERT parameter tuple for pgsqlite (arrays as native lists)"""
+        return (row_id,) + tuple(data[column] for column in ARRAY_COLUMNS)
+
+    def measure_time(self, func, *args, **kwargs) -> Tuple[float, Any]:
+        """Measure execution time of a function in seconds, at nanosecond resolution"""
+        start = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end = time.perf_counter()
-        return end - start, result
-
-    def benchmark_sqlite_arrays(self, array_size: int) -> Dict[str, float]:
+        end = time.perf_counter_ns()
+        return (end - start) / 1e9, result
+
+    def time_each(self, execute, sql: str, param_rows: List[Tuple], **kwargs) -> List[float]:
+        """Time execute(sql, params) once per parameter row.
+
+        The clock and execute method are bound to locals and the sample list is
+        preallocated, so per-row interpreter overhead stays out of the samples
+        without going through measure_time for every call.
+        """
+        clock = time.perf_counter_ns
+        samples = [0.0] * len(param_rows)
+        for index, params in enumerate(param_rows):
+            start = clock()
+            execute(sql, params, **kwargs)
+            samples[index] = (clock() - start) / 1e9
+        return samples
+
+    def summarize(self, samples: List[float]) -> Dict[str, float]:
+        """Reduce timing samples to min/median/p95 (min is the headline micro-benchmark figure)"""
+        if not samples:
+            return {"min": 0, "median": 0, "p95": 0}
+        minimum, median, p95 = np.percentile(samples, [0, 50, 95])
+        return {"min": float(minimum), "median": float(median), "p95": float(p95)}
+
+    def connect_sqlite(self) -> sqlite3.Connection:
+        """Open the SQLite connection shared by every array size"""
+        # In memory mode only the direct-SQLite baseline skips the filesystem;
+        # the pgsqlite server always works on its own database file. --parallel
+        # uses the connection from a worker thread, one size at a time.
+        conn = sqlite3.connect(":memory:" if self.sqlite_mode == "memory" else self.sqlite_file,
+                               check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # Manage transactions explicitly instead of sqlite3's implicit BEGINs
+        conn.isolation_level = None
+        return conn
+
+    def benchmark_sqlite_arrays(self, dataset: List[Dict[str, Any]], conn) -> Dict[str, List[float]]:
         """Benchmark array operations using direct SQLite access"""
-        conn = sqlite3.connect(self.sqlite_file)
         cursor = conn.cursor()
 
         times = {}
 
-        # Drop and create table for clean state
-        try:
-            cursor.execute("DROP TABLE IF EXISTS array_bench_sqlite")
-        except:
-            pass
-
+        # Create the table once and empty it, keeping the schema (and the
+        # statement cache) intact instead of dropping it for a clean state.
+        # CREATE is only timed when it actually creates the table.
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'array_bench_sqlite'").fetchone()
         create_time, _ = self.measure_time(cursor.execute, """
-            CREATE TABLE array_bench_sqlite (
+            CREATE TABLE IF NOT EXISTS array_bench_sqlite (
                 id INTEGER PRIMARY KEY,
                 int_array TEXT,
                 bigint_array TEXT,
@@ -94,71 +239,137 @@ class ArrayBenchmarkRunner:
                 bool_array TEXT
             )
         """)
-        times['CREATE'] = create_time
-
-        # Generate test data
-        test_data = self.generate_test_arrays(array_size)
+        if not exists:
+            times['CREATE'] = [create_time]
+        cursor.execute("DELETE FROM array_bench_sqlite")
 
         # Benchmark INSERT
-        insert_times = []
-        for i in range(self.iterations):
-            data = self.generate_test_arrays(array_size)
-            insert_time, _ = self.measure_time(cursor.execute,
+        insert_rows = [self.sqlite_row(i, data) for i, data in enumerate(dataset)]
+        cursor.execute("BEGIN")
+        times['INSERT'] = self.time_each(cursor.execute,
+            """INSERT INTO array_bench_sqlite
+               (id, int_array, bigint_array, text_array, float_array, bool_array)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            insert_rows
+        )
+        conn.commit()
+
+        # Benchmark batched INSERT (rows built up front, one executemany call)
+        batch_rows = [self.sqlite_row(len(dataset) + i, data) for i, data in enumerate(dataset)]
+        cursor.execute("BEGIN")
+        batch_time, _ = self.measure_time(cursor.executemany,
+            """INSERT INTO array_bench_sqlite
+               (id, int_array, bigint_array, text_array, float_array, bool_array)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            batch_rows
+        )
+        times['BATCH_INSERT'] = [batch_time / len(batch_rows)]
+        conn.commit()
+
+        # Benchmark bulk INSERT (executemany inside one explicit transaction)
+        bulk_rows = [self.sqlite_row(2 * len(dataset) + i, data) for i, data in enumerate(dataset)]
+
+        def bulk_insert():
+            cursor.execute("BEGIN")
+            cursor.executemany(
                 """INSERT INTO array_bench_sqlite
                    (id, int_array, bigint_array, text_array, float_array, bool_array)
                    VALUES (?, ?, ?, ?, ?, ?)""",
-                (i, json.dumps(data["int_array"]), json.dumps(data["bigint_array"]),
-                 json.dumps(data["text_array"]), json.dumps(data["float_array"]),
-                 json.dumps(data["bool_array"]))
+                bulk_rows
             )
-            insert_times.append(insert_time)
+            conn.commit()
 
-        times['INSERT'] = statistics.mean(insert_times)
-        conn.commit()
+        bulk_time, _ = self.measure_time(bulk_insert)
+        times['BULK_INSERT'] = [bulk_time / len(bulk_rows)]
+
+        # Benchmark SELECT (timed through fetchone so row materialization is included)
+        def select_row(row_id):
+            cursor.execute(
+                "SELECT int_array, text_array, float_array FROM array_bench_sqlite WHERE id = ?", (row_id,))
+            return cursor.fetchone()
 
-        # Benchmark SELECT
         select_times = []
-        for i in range(min(50, self.iterations)):  # Fewer iterations for SELECT
-            select_time, _ = self.measure_time(cursor.execute,
-                "SELECT int_array, text_array, float_array FROM array_bench_sqlite WHERE id = ?", (i,))
-            result = cursor.fetchone()
+        for i in range(min(50, len(dataset))):  # Fewer iterations for SELECT
+            select_time, _ = self.measure_time(select_row, i)
             select_times.append(select_time)
 
-        times['SELECT'] = statistics.mean(select_times)
+        times['SELECT'] = select_times
 
         # Benchmark UPDATE
-        update_times = []
-        for i in range(min(50, self.iterations)):
-            new_data = self.generate_test_arrays(array_size)
-            update_time, _ = self.measure_time(cursor.execute,
-                "UPDATE array_bench_sqlite SET int_array = ? WHERE id = ?",
-                (json.dumps(new_data["int_array"]), i))
-            update_times.append(update_time)
-
-        times['UPDATE'] = statistics.mean(update_times)
+        update_rows = [(dataset[i]["_json_update_int_array"], i) for i in range(min(50, len(dataset)))]
+        cursor.execute("BEGIN")
+        times['UPDATE'] = self.time_each(cursor.execute,
+            "UPDATE array_bench_sqlite SET int_array = ? WHERE id = ?",
+            update_rows
+        )
         conn.commit()
 
-        conn.close()
+        # Benchmark INSERT/SELECT with int/float arrays packed as binary BLOBs
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS array_bench_sqlite_blob (
+                id INTEGER PRIMARY KEY,
+                int_array BLOB,
+                bigint_array TEXT,
+                text_array TEXT,
+                float_array BLOB,
+                bool_array TEXT
+            )
+        """)
+        cursor.execute("DELETE FROM array_bench_sqlite_blob")
+
+        blob_rows = [self.sqlite_blob_row(i, data) for i, data in enumerate(dataset)]
+        cursor.execute("BEGIN")
+        times['INSERT_BLOB'] = self.time_each(cursor.execute,
+            """INSERT INTO array_bench_sqlite_blob
+               (id, int_array, bigint_array, text_array, float_array, bool_array)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            blob_rows
+        )
+        conn.commit()
+
+        def select_blob_row(row_id):
+            cursor.execute(
+                "SELECT int_array, text_array, float_array FROM array_bench_sqlite_blob WHERE id = ?", (row_id,))
+            int_blob, text_array, float_blob = cursor.fetchone()
+            return decode_int_array(int_blob), text_array, decode_float_array(float_blob)
+
+        select_times = []
+        for i in range(min(50, len(dataset))):
+            select_time, _ = self.measure_time(select_blob_row, i)
+            select_times.append(select_time)
+
+        times['SELECT_BLOB'] = select_times
+
         return times
 
-    def benchmark_pgsqlite_arrays(self, array_size: int) -> Dict[str, float]:
-        """Benchmark array operations using pgsqlite with psycopg3 binary"""
+    def connect_pgsqlite(self):
+        """Open the psycopg3 connection shared by every array size"""
         conn = self.psycopg.connect(f"host=localhost port={self.port} user=postgres dbname={self.sqlite_file}")
+        conn.autocommit = False
+        # Prepare every statement from its first execution
+        conn.prepare_threshold = 0
+        return conn
+
+    def benchmark_pgsqlite_arrays(self, dataset: List[Dict[str, Any]], conn, table: str) -> Dict[str, List[float]]:
+        """Benchmark array operations using pgsqlite with psycopg3 binary"""
+        insert_sql = PG_INSERT_SQL.format(table=table)
+        select_sql = PG_SELECT_SQL.format(table=table)
+        update_sql = PG_UPDATE_SQL.format(table=table)
 
         times = {}
 
         try:
             with conn.cursor() as cur:
-                # Drop and create table for clean state
+                # Create the table once and empty it (pgsqlite has no TRUNCATE);
+                # as on the SQLite side, CREATE is only timed when the table is new
                 try:
-                    cur.execute("DROP TABLE IF EXISTS array_bench_pgsqlite")
-                    conn.commit()
-                except:
-                    pass
-
-                # Create table
-                create_time, _ = self.measure_time(cur.execute, """
-                    CREATE TABLE array_bench_pgsqlite (
+                    cur.execute(f"SELECT 1 FROM {table} LIMIT 1")
+                    exists = True
+                except self.psycopg.Error:
+                    conn.rollback()
+                    exists = False
+                create_time, _ = self.measure_time(cur.execute, f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
                         id INTEGER PRIMARY KEY,
                         int_array INTEGER[],
                         bigint_array BIGINT[],
@@ -167,89 +378,148 @@ class ArrayBenchmarkRunner:
                         bool_array BOOLEAN[]
                     )
                 """)
-                times['CREATE'] = create_time
+                if not exists:
+                    times['CREATE'] = [create_time]
+                cur.execute(f"DELETE FROM {table}")
                 conn.commit()
 
                 # Benchmark INSERT with binary protocol
-                insert_times = []
-                for i in range(self.iterations):
-                    data = self.generate_test_arrays(array_size)
-                    insert_time, _ = self.measure_time(cur.execute,
-                        """INSERT INTO array_bench_pgsqlite
-                           (id, int_array, bigint_array, text_array, float_array, bool_array)
-                           VALUES (%s, %s, %s, %s, %s, %s)""",
-                        (i, json.dumps(data["int_array"]), json.dumps(data["bigint_array"]),
-                         json.dumps(data["text_array"]), json.dumps(data["float_array"]),
-                         json.dumps(data["bool_array"])),
-                        binary=True  # Enable binary protocol
-                    )
-                    insert_times.append(insert_time)
+                insert_rows = [self.pgsqlite_row(i, data) for i, data in enumerate(dataset)]
+                times['INSERT'] = self.time_each(cur.execute, insert_sql, insert_rows,
+                                                 prepare=True,
+                                                 binary=True)  # Enable binary protocol
+                conn.commit()
+
+                # Arrays must round-trip as native lists, not JSON text
+                cur.execute(f"SELECT int_array FROM {table} WHERE id = %s", [0], binary=True)
+                returned = cur.fetchone()[0]
+                assert isinstance(returned, list), \
+                    f"int_array returned as {type(returned).__name__}, expected list"
 
-                times['INSERT'] = statistics.mean(insert_times)
+                # Benchmark batched INSERT (rows built up front, one executemany call)
+                batch_rows = [self.pgsqlite_row(len(dataset) + i, data) for i, data in enumerate(dataset)]
+                batch_time, _ = self.measure_time(cur.executemany, insert_sql, batch_rows)
+                times['BATCH_INSERT'] = [batch_time / len(batch_rows)]
                 conn.commit()
 
-                # Benchmark SELECT with binary results
+                # Benchmark bulk INSERT (all rows in one multi-VALUES statement).
+                # pgsqlite has no COPY support, so this is the single-statement bulk path.
+                bulk_rows = [self.pgsqlite_row(2 * len(dataset) + i, data) for i, data in enumerate(dataset)]
+                bulk_sql = (
+                    f"""INSERT INTO {table}
+                       (id, int_array, bigint_array, text_array, float_array, bool_array)
+                       VALUES """ + ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(bulk_rows))
+                )
+                bulk_params = [value for row in bulk_rows for value in row]
+
+                def bulk_insert():
+                    cur.execute(bulk_sql, bulk_params, binary=True)
+                    conn.commit()
+
+                bulk_time, _ = self.measure_time(bulk_insert)
+                times['BULK_INSERT'] = [bulk_time / len(bulk_rows)]
+
+                # Benchmark pipelined INSERT (prepared executes queued client-side and
+                # flushed together, so rows don't each wait for a round-trip). Only the
+                # whole block is timed; per-row times are meaningless in pipeline mode.
+                pipeline_rows = [self.pgsqlite_row(3 * len(dataset) + i, data) for i, data in enumerate(dataset)]
+
+                def pipeline_insert():
+                    with conn.pipeline():
+                        for row in pipeline_rows:
+                            cur.execute(insert_sql, row, prepare=True, binary=True)
+                    conn.commit()
+
+                pipeline_time, _ = self.measure_time(pipeline_insert)
+                times['INSERT_PIPELINE'] = [pipeline_time / len(pipeline_rows)]
+
+                # Benchmark SELECT with binary results (timed through fetchone so
+                # array decoding is included)
+                def select_row(row_id):
+                    cur.execute(select_sql, [row_id], prepare=True, binary=True)
+                    return cur.fetchone()
+
                 select_times = []
-                for i in range(min(50, self.iterations)):
-                    select_time, _ = self.measure_time(cur.execute,
-                        "SELECT int_array, text_array, float_array FROM array_bench_pgsqlite WHERE id = %s",
-                        [i], binary=True)
-                    result = cur.fetchone()
+                for i in range(min(50, len(dataset))):
+                    select_time, _ = self.measure_time(select_row, i)
                     select_times.append(select_time)
 
-                times['SELECT'] = statistics.mean(select_times)
+                times['SELECT'] = select_times
 
                 # Benchmark UPDATE with binary protocol
-                update_times = []
-                for i in range(min(50, self.iterations)):
-                    new_data = self.generate_test_arrays(array_size)
-                    update_time, _ = self.measure_time(cur.execute,
-                        "UPDATE array_bench_pgsqlite SET int_array = %s WHERE id = %s",
-                        (json.dumps(new_data["int_array"]), i),
-                        binary=True)
-                    update_times.append(update_time)
-
-                times['UPDATE'] = statistics.mean(update_times)
+                update_rows = [(dataset[i]["_update_int_array"], i) for i in range(min(50, len(dataset)))]
+                times['UPDATE'] = self.time_each(cur.execute, update_sql, update_rows,
+                                                 prepare=True,
+                                                 binary=True)
                 conn.commit()
 
-        finally:
-            conn.close()
+        except Exception:
+            conn.rollback()
+            raise
 
         return times
 
-    def run_array_size_benchmark(self, array_size: int):
+    def run_array_size_benchmark(self, array_size: int, sqlite_conn, pg_conn):
         """Run benchmark for a specific array size"""
         print(f"{Fore.CYAN}Benchmarking arrays of size {array_size}...{Style.RESET_ALL}")
 
-        # Setup fresh database
-        self.setup()
-
-        # Run SQLite benchmarks
-        print(f"  Running SQLite benchmarks...")
-        sqlite_times = self.benchmark_sqlite_arrays(array_size)
-
-        # Run pgsqlite benchmarks
-        print(f"  Running pgsqlite benchmarks...")
-        pgsqlite_times = self.benchmark_pgsqlite_arrays(array_size)
+        # Generate identical test data for both engines, outside the timed loops
+        if array_size not in self._precomputed:
+            if self.trace_memory:
+                tracemalloc.start()
+            self._precomputed[array_size] = self.prepare_dataset(array_size)
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"  Test data memory: {current / 1024:.1f} KiB retained, {peak / 1024:.1f} KiB peak")
+        dataset = self._precomputed[array_size]
+
+        pg_table = "array_bench_pgsqlite"
+        if self.parallel:
+            # The engines use separate connections and files; each still runs its
+            # own loop single-threaded, only the two engines overlap
+            print(f"  Running SQLite and pgsqlite benchmarks in parallel...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                sqlite_future = executor.submit(self.benchmark_sqlite_arrays, dataset, sqlite_conn)
+                pgsqlite_future = executor.submit(self.benchmark_pgsqlite_arrays, dataset, pg_conn, pg_table)
+                sqlite_times = sqlite_future.result()
+                pgsqlite_times = pgsqlite_future.result()
+        else:
+            # Run SQLite benchmarks
+            print(f"  Running SQLite benchmarks...")
+            sqlite_times = self.benchmark_sqlite_arrays(dataset, sqlite_conn)
+
+            # Run pgsqlite benchmarks
+            print(f"  Running pgsqlite benchmarks...")
+            pgsqlite_times = self.benchmark_pgsqlite_arrays(dataset, pg_conn, pg_table)
 
         # Calculate results
-        for operation in ["CREATE", "INSERT", "SELECT", "UPDATE"]:
-            sqlite_time = sqlite_times.get(operation, 0)
-            pgsqlite_time = pgsqlite_times.get(operation, 0)
-            overhead = pgsqlite_time / sqlite_time if sqlite_time > 0 else 0
-
+        for operation in ["CREATE", "INSERT", "BATCH_INSERT", "BULK_INSERT", "INSERT_PIPELINE", "SELECT",
+                          "UPDATE", "INSERT_BLOB", "SELECT_BLOB"]:
+            sqlite_samples = sqlite_times.get(PGSQLITE_VARIANTS.get(operation, operation), [])
+            pgsqlite_samples = pgsqlite_times.get(SQLITE_VARIANTS.get(operation, operation), [])
+            if not sqlite_samples or not pgsqlite_samples:
+                # CREATE after the first size (or against a reused server database)
+                continue
+            sqlite_stats = self.summarize(sqlite_samples)
+            pgsqlite_stats = self.summarize(pgsqlite_samples)
+            overhead = pgsqlite_stats["min"] / sqlite_stats["min"] if sqlite_stats["min"] > 0 else 0
+
+            # All times converted to ms
             result = ArrayBenchmarkResult(
                 operation=operation,
                 data_type="mixed_arrays",
                 array_size=array_size,
-                sqlite_time=sqlite_time * 1000,  # Convert to ms
-                pgsqlite_time=pgsqlite_time * 1000,  # Convert to ms
-                overhead_factor=overhead
+                sqlite_time=sqlite_stats["min"] * 1000,
+                pgsqlite_time=pgsqlite_stats["min"] * 1000,
+                overhead_factor=overhead,
+                sqlite_median=sqlite_stats["median"] * 1000,
+                pgsqlite_median=pgsqlite_stats["median"] * 1000,
+                sqlite_p95=sqlite_stats["p95"] * 1000,
+                pgsqlite_p95=pgsqlite_stats["p95"] * 1000
             )
             self.results.append(result)
 
-        self.cleanup()
-
     def run_benchmarks(self):
         """Run benchmarks for different array sizes"""
         print(f"{Fore.GREEN}🚀 Array Binary Protocol Benchmark{Style.RESET_ALL}")
@@ -261,19 +531,64 @@ class ArrayBenchmarkRunner:
         # Test different array sizes
         array_sizes = [5, 10, 50, 100, 500]
 
-        for i, size in enumerate(array_sizes):
-            # Use unique database for each array size
-            original_db = self.sqlite_file
-            self.sqlite_file = f"array_benchmark_test_{i}_{size}.db"
-            self.run_array_size_benchmark(size)
-            self.sqlite_file = original_db
+        # One connection and one table per engine for all sizes, emptied between
+        # sizes, so both keep their schema and statement caches alike
+        self.setup()
+        sqlite_conn = self.connect_sqlite()
+        pg_conn = self.connect_pgsqlite()
 
-        self.print_results()
+        try:
+            for size in array_sizes:
+                self.run_array_size_benchmark(size, sqlite_conn, pg_conn)
+        finally:
+            pg_conn.close()
+            sqlite_conn.close()
+            self.cleanup()
+
+        if self.output_format == "table":
+            self.print_results()
+        else:
+            self.write_results()
+
+    def write_results(self):
+        """Write raw results as JSON or CSV (times in ms) for scripted comparisons"""
+        out = open(self.output_file, "w", newline="") if self.output_file else sys.stdout
+        try:
+            if self.output_format == "json":
+                json.dump([asdict(result) for result in self.results], out, indent=2)
+                out.write("\n")
+            else:
+                writer = csv.DictWriter(out, fieldnames=[field.name for field in fields(ArrayBenchmarkResult)])
+                writer.writeheader()
+                writer.writerows(asdict(result) for result in self.results)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+    def overhead_color(self, overhead: float) -> str:
+        """Pick the color prefix for an overhead factor"""
+        if overhead < 100:
+            return _GREEN
+        if overhead < 500:
+            return _YELLOW
+        return _RED
+
+    def operation_mode(self, operation: str) -> str:
+        """Describe how an operation's time was measured"""
+        if operation == "CREATE":
+            # Tables are kept across sizes, so CREATE only runs for the first one
+            return "first size"
+        return "bulk" if operation in BULK_OPERATIONS else "single-row"
 
     def print_results(self):
         """Print benchmark results in a formatted table"""
         print(f"\n{Fore.GREEN}📊 Array Binary Protocol Performance Results{Style.RESET_ALL}")
         print("=" * 80)
+        if self.sqlite_mode == "memory":
+            print("SQLite baseline: in-memory database (pgsqlite still uses an on-disk file, "
+                  "so CREATE/write overheads include disk I/O only on the pgsqlite side)")
+        else:
+            print("SQLite baseline: on-disk database file")
 
         # Group results by array size
         size_groups = {}
@@ -287,23 +602,26 @@ class ArrayBenchmarkRunner:
 
             table_data = []
             for result in size_groups[array_size]:
-                overhead_color = ""
-                if result.overhead_factor < 100:
-                    overhead_color = Fore.GREEN
-                elif result.overhead_factor < 500:
-                    overhead_color = Fore.YELLOW
-                else:
-                    overhead_color = Fore.RED
+                overhead_color = self.overhead_color(result.overhead_factor)
 
                 table_data.append([
                     result.operation,
+                    self.operation_mode(result.operation),
                     f"{result.sqlite_time:.3f}",
+                    f"{result.sqlite_median:.3f}",
+                    f"{result.sqlite_p95:.3f}",
                     f"{result.pgsqlite_time:.3f}",
-                    f"{overhead_color}{result.overhead_factor:.1f}x{Style.RESET_ALL}"
+                    f"{result.pgsqlite_median:.3f}",
+                    f"{result.pgsqlite_p95:.3f}",
+                    overhead_color + f"{result.overhead_factor:.1f}x" + _RESET
                 ])
 
-            headers = ["Operation", "SQLite (ms)", "pgsqlite (ms)", "Overhead"]
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+            headers = ["Operation", "Mode",
+                       "SQLite min (ms)", "SQLite p50", "SQLite p95",
+                       "pgsqlite min (ms)", "pgsqlite p50", "pgsqlite p95",
+                       "Overhead (min)"]
+            # Cells are preformatted strings; skip tabulate's per-cell number parsing
+            print(tabulate(table_data, headers=headers, tablefmt="grid", disable_numparse=True))
 
         # Summary
         print(f"\n{Fore.CYAN}📈 Summary{Style.RESET_ALL}")
@@ -316,13 +634,13 @@ class ArrayBenchmarkRunner:
         summary_data = []
         for operation, overheads in avg_overhead_by_op.items():
             avg_overhead = statistics.mean(overheads)
-            color = Fore.GREEN if avg_overhead < 100 else Fore.YELLOW if avg_overhead < 500 else Fore.RED
             summary_data.append([
                 operation,
-                f"{color}{avg_overhead:.1f}x{Style.RESET_ALL}"
+                self.overhead_color(avg_overhead) + f"{avg_overhead:.1f}x" + _RESET
             ])
 
-        print(tabulate(summary_data, headers=["Operation", "Avg Overhead"], tablefmt="grid"))
+        print(tabulate(summary_data, headers=["Operation", "Avg Overhead"], tablefmt="grid",
+                       disable_numparse=True))
 
         print(f"\n{Fore.GREEN}✅ Array binary protocol benchmarking complete!{Style.RESET_ALL}")
 
@@ -334,10 +652,23 @@ def main():
                        help="Number of iterations for each test")
     parser.add_argument("--port", "-p", type=int, default=15500,
                        help="pgsqlite server port")
+    parser.add_argument("--trace-memory", action="store_true",
+                       help="Report tracemalloc usage of test data generation")
+    parser.add_argument("--sqlite-mode", choices=["file", "memory"], default="file",
+                       help="Storage for the direct SQLite baseline (default: file)")
+    parser.add_argument("--parallel", action="store_true",
+                       help="Run the SQLite and pgsqlite benchmarks concurrently")
+    parser.add_argument("--format", choices=["table", "json", "csv"], default="table",
+                       help="Results format (default: table)")
+    parser.add_argument("--output", "-o",
+                       help="Write json/csv results to this file instead of stdout")
 
     args = parser.parse_args()
 
-    runner = ArrayBenchmarkRunner(iterations=args.iterations, port=args.port)
+    runner = ArrayBenchmarkRunner(iterations=args.iterations, port=args.port,
+                                  trace_memory=args.trace_memory, sqlite_mode=args.sqlite_mode,
+                                  parallel=args.parallel, output_format=args.format,
+                                  output_file=args.output)
     runner.run_benchmarks()
 
 if __name__ == "__main__":
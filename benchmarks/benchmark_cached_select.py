@@ -6,12 +6,38 @@ Benchmark cached SELECT performance vs raw SQLite
 import time
 import sqlite3
 import psycopg2
+from array import array
 from statistics import mean, stdev
 from colorama import init, Fore, Style
 
 init(autoreset=True)
 
-def benchmark_sqlite(iterations=1000):
+def time_queries(cursor, sql, params, iterations, detailed=False):
+    """Run a SELECT `iterations` times and return per-query times in ms.
+    
+    By default only the whole loop is timed and every query gets an equal
+    share, so no timer or append cost lands inside the loop; with `detailed`
+    each query is timed on its own into a preallocated array.
+    """
+    execute = cursor.execute
+    fetchall = cursor.fetchall
+    clock = time.perf_counter_ns
+    if not detailed:
+        start = clock()
+        for _ in range(iterations):
+            execute(sql, params)
+            fetchall()
+        return [(clock() - start) / iterations / 1e6] * iterations
+    
+    times = array('q', bytes(8 * iterations))
+    for i in range(iterations):
+        start = clock()
+        execute(sql, params)
+        fetchall()
+        times[i] = clock() - start
+    return [t / 1e6 for t in times]
+
+def benchmark_sqlite(iterations=1000, detailed=False):
     """Benchmark raw SQLite cached SELECT"""
     conn = sqlite3.connect(':memory:')
     cursor = conn.cursor()
@@ -37,18 +63,13 @@ def benchmark_sqlite(iterations=1000):
         cursor.fetchall()
     
     # Benchmark cached queries
-    times = []
-    for _ in range(iterations):
-        start = time.perf_counter()
-        cursor.execute("SELECT * FROM bench_table WHERE value = ?", (50,))
-        result = cursor.fetchall()
-        end = time.perf_counter()
-        times.append((end - start) * 1000)  # Convert to ms
+    times = time_queries(cursor, "SELECT * FROM bench_table WHERE value = ?", (50,),
+                         iterations, detailed)
     
     conn.close()
     return times
 
-def benchmark_pgsqlite(port, iterations=1000):
+def benchmark_pgsqlite(port, iterations=1000, detailed=False, reuse=False):
     """Benchmark pgsqlite cached SELECT"""
     conn = psycopg2.connect(
         host='localhost',
@@ -58,15 +79,19 @@ def benchmark_pgsqlite(port, iterations=1000):
     )
     cursor = conn.cursor()
     
-    # Create and populate table
-    cursor.execute("DROP TABLE IF EXISTS bench_table")
+    # Create and populate table. With reuse the schema from an earlier run is kept
+    # and only emptied, so the server's statement and schema caches stay valid
+    if not reuse:
+        cursor.execute("DROP TABLE IF EXISTS bench_table")
     cursor.execute("""
-        CREATE TABLE bench_table (
+        CREATE TABLE IF NOT EXISTS bench_table (
             id SERIAL PRIMARY KEY,
             value INTEGER,
             name TEXT
         )
     """)
+    if reuse:
+        cursor.execute("DELETE FROM bench_table")
     
     # Insert test data using prepared statements
     for i in range(100):
@@ -79,13 +104,8 @@ def benchmark_pgsqlite(port, iterations=1000):
         cursor.fetchall()
     
     # Benchmark cached queries
-    times = []
-    for _ in range(iterations):
-        start = time.perf_counter()
-        cursor.execute("SELECT * FROM bench_table WHERE value = %s", (50,))
-        result = cursor.fetchall()
-        end = time.perf_counter()
-        times.append((end - start) * 1000)  # Convert to ms
+    times = time_queries(cursor, "SELECT * FROM bench_table WHERE value = %s", (50,),
+                         iterations, detailed)
     
     conn.close()
     return times
@@ -95,6 +115,10 @@ def main():
     parser = argparse.ArgumentParser(description='Benchmark cached SELECT performance')
     parser.add_argument('--iterations', type=int, default=1000, help='Number of iterations')
     parser.add_argument('--port', type=int, default=5434, help='pgsqlite port')
+    parser.add_argument('--reuse', action='store_true',
+                        help='Keep the pgsqlite table from a previous run and only delete its rows')
+    parser.add_argument('--detailed', action='store_true',
+                        help='Time every query individually (adds timer overhead; needed for the ± spread)')
     args = parser.parse_args()
     
     print(f"{Fore.CYAN}{'='*60}")
@@ -104,13 +128,13 @@ def main():
     
     # SQLite benchmark
     print(f"\n{Fore.YELLOW}Running SQLite benchmark...{Style.RESET_ALL}")
-    sqlite_times = benchmark_sqlite(args.iterations)
+    sqlite_times = benchmark_sqlite(args.iterations, args.detailed)
     sqlite_avg = mean(sqlite_times)
     sqlite_std = stdev(sqlite_times) if len(sqlite_times) > 1 else 0
     
     # pgsqlite benchmark
     print(f"{Fore.YELLOW}Running pgsqlite benchmark...{Style.RESET_ALL}")
-    pgsqlite_times = benchmark_pgsqlite(args.port, args.iterations)
+    pgsqlite_times = benchmark_pgsqlite(args.port, args.iterations, args.detailed, args.reuse)
     pgsqlite_avg = mean(pgsqlite_times)
     pgsqlite_std = stdev(pgsqlite_times) if len(pgsqlite_times) > 1 else 0
     
@@ -119,8 +143,12 @@ def main():
     overhead_percent = ((pgsqlite_avg - sqlite_avg) / sqlite_avg) * 100
     
     print(f"\n{Fore.GREEN}RESULTS:{Style.RESET_ALL}")
-    print(f"SQLite:   {sqlite_avg:.4f}ms (±{sqlite_std:.4f}ms)")
-    print(f"pgsqlite: {pgsqlite_avg:.4f}ms (±{pgsqlite_std:.4f}ms)")
+    if args.detailed:
+        print(f"SQLite:   {sqlite_avg:.4f}ms (±{sqlite_std:.4f}ms)")
+        print(f"pgsqlite: {pgsqlite_avg:.4f}ms (±{pgsqlite_std:.4f}ms)")
+    else:
+        print(f"SQLite:   {sqlite_avg:.4f}ms")
+        print(f"pgsqlite: {pgsqlite_avg:.4f}ms")
     print(f"Overhead: {overhead_factor:.1f}x ({overhead_percent:.1f}%)")
     
     # Check against target
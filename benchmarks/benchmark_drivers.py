@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 """
 Benchmark script comparing SQLite direct access vs PostgreSQL client via pgsqlite.
-Supports both psycopg2 and psycopg3 drivers.
+Supports psycopg2, psycopg3 and asyncpg drivers.
 """
 
+import contextlib
+import io
+import itertools
+import json
+import re
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import time
 import random
 import string
-import statistics
+import numpy as np
 from dataclasses import dataclass
 from typing import List, Dict, Any, Tuple, Optional
-from tabulate import tabulate
 from colorama import init, Fore, Style
 import os
 import sys
@@ -19,6 +25,46 @@ import sys
 # Initialize colorama
 init()
 
+# Operations reported for both engines
+OPERATIONS = ["CREATE", "INSERT", "UPDATE", "DELETE", "SELECT", "SELECT_PK", "SELECT (cached)",
+              "SELECT (cached, batched)"]
+
+# pgsqlite-only mixed workload replayed in psycopg3 pipeline mode (--pipeline)
+PIPELINED = "MIXED (pipelined)"
+
+# pgsqlite-only mixed workload run from several connections at once (--concurrency)
+CONCURRENT = "MIXED (concurrent)"
+
+# Character codes random test strings are drawn from
+ALPHANUMERIC_CODES = np.frombuffer((string.ascii_letters + string.digits).encode("ascii"), dtype=np.uint8)
+
+# Maps every byte value onto an alphanumeric character (62 doesn't divide 256,
+# so the first few characters are marginally more likely; fine for test data)
+ALPHANUMERIC_TABLE = ALPHANUMERIC_CODES[np.arange(256) % len(ALPHANUMERIC_CODES)].tobytes()
+
+# Operations drawn at random by the mixed-operation loops
+MIXED_OPERATIONS = ("INSERT", "UPDATE", "DELETE", "SELECT", "SELECT_PK")
+
+# Write statements of the mixed-operation loops, one per row unless --batch-writes
+# buffers consecutive writes of the same kind and flushes them in one call
+SQLITE_WRITE_SQL = {
+    "INSERT": "INSERT INTO benchmark_table (text_col, int_col, real_col, bool_col) VALUES (?, ?, ?, ?)",
+    "UPDATE": "UPDATE benchmark_table SET text_col = ? WHERE id = ?",
+    "DELETE": "DELETE FROM benchmark_table WHERE id = ?",
+}
+PGSQLITE_WRITE_SQL = {
+    "INSERT": "INSERT INTO benchmark_table_pg (text_col, int_col, real_col, bool_col) VALUES ",
+    "UPDATE": "UPDATE benchmark_table_pg SET text_col = %s WHERE id = %s",
+    "DELETE": "DELETE FROM benchmark_table_pg WHERE id = %s",
+}
+
+def format_plain_table(rows: List[List[Any]], headers: List[str]) -> str:
+    """Format rows as fixed-width plain text (no tabulate, no ANSI escapes)"""
+    cells = [[str(cell) for cell in row] for row in [headers] + rows]
+    widths = [max(len(row[i]) for row in cells) + 2 for i in range(len(headers))]
+    return "\n".join("".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+                     for row in cells)
+
 @dataclass
 class BenchmarkResult:
     operation: str
@@ -26,10 +72,169 @@ class BenchmarkResult:
     pgsqlite_time: float
     count: int
 
+class OperationTimings:
+    """Per-operation timings kept in preallocated int64 nanosecond buffers"""
+    
+    def __init__(self, operations: List[str], capacity: int):
+        self._buffers = {op: np.empty(capacity, dtype=np.int64) for op in operations}
+        self._counts = dict.fromkeys(operations, 0)
+        # (first sample index, count) of every batched span; single-statement
+        # spans are the samples outside them, so the hot path records nothing extra
+        self._batches = {op: [] for op in operations}
+    
+    def add(self, operation: str, elapsed_ns: int, count: int = 1):
+        """Record elapsed_ns for count samples of an operation, all from one timed span"""
+        n = self._counts[operation]
+        if count > 1:
+            self._batches[operation].append((n, count))
+        buffer = self._buffers[operation]
+        if n + count > len(buffer):
+            buffer = self._buffers[operation] = np.resize(buffer, max(2 * len(buffer), n + count))
+        buffer[n:n + count] = elapsed_ns
+        self._counts[operation] = n + count
+    
+    def __getitem__(self, operation: str) -> np.ndarray:
+        """Recorded samples of an operation, in seconds"""
+        return self._buffers[operation][:self._counts[operation]] / 1e9
+    
+    @property
+    def operations(self) -> List[str]:
+        """Operations this store records, in definition order"""
+        return list(self._counts)
+    
+    def samples_ns(self, operation: str) -> np.ndarray:
+        """Recorded samples of an operation, in raw nanoseconds"""
+        return self._buffers[operation][:self._counts[operation]]
+    
+    def spans_ns(self, operation: str) -> List[Tuple[int, int]]:
+        """(total_ns, count) of every timed span of an operation, one entry per batch"""
+        samples = self.samples_ns(operation).tolist()
+        spans, position = [], 0
+        for first, count in self._batches[operation]:
+            spans.extend((elapsed, 1) for elapsed in samples[position:first])
+            spans.append((samples[first] * count, count))
+            position = first + count
+        spans.extend((elapsed, 1) for elapsed in samples[position:])
+        return spans
+    
+    def totals(self, operations: List[str]) -> Tuple[int, float]:
+        """Sample count and summed seconds across operations, without joining their buffers"""
+        count = sum(self._counts[op] for op in operations)
+        total_ns = sum(int(self._buffers[op][:self._counts[op]].sum()) for op in operations)
+        return count, total_ns / 1e9
+
+class IdPool:
+    """Live row ids in a flat int64 buffer with O(1) random pick and removal"""
+    
+    def __init__(self, capacity: int = 1024):
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._n = 0
+    
+    def __len__(self) -> int:
+        return self._n
+    
+    def extend(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        if self._n + len(ids) > len(self._ids):
+            self._ids = np.resize(self._ids, max(2 * len(self._ids), self._n + len(ids)))
+        self._ids[self._n:self._n + len(ids)] = ids
+        self._n += len(ids)
+    
+    def append(self, row_id: int):
+        self.extend((row_id,))
+    
+    def pick(self) -> int:
+        """Return a random live id"""
+        return int(self._ids[random.randrange(self._n)])
+    
+    def pop_random(self) -> int:
+        """Remove and return a random live id (the last id is swapped into its slot)"""
+        index = random.randrange(self._n)
+        row_id = int(self._ids[index])
+        self._n -= 1
+        self._ids[index] = self._ids[self._n]
+        return row_id
+
+class AsyncpgCursor:
+    """Minimal DB-API style cursor over an asyncpg connection.
+    
+    Parameterized statements are prepared once per SQL text and reused, so
+    repeats only bind and execute with asyncpg's binary encoding.
+    """
+    
+    def __init__(self, conn, loop):
+        self._conn = conn
+        self._loop = loop
+        self._statements = {}
+        self._rows = []
+    
+    @staticmethod
+    def _numbered(sql: str) -> str:
+        """Convert %s placeholders to asyncpg's $1, $2, ..."""
+        counter = iter(range(1, sql.count("%s") + 1))
+        return re.sub(r"%s", lambda _: f"${next(counter)}", sql)
+    
+    def execute(self, sql: str, params: Tuple = ()):
+        if not params:
+            # DDL and multi-statement scripts go through the simple query protocol
+            self._loop.run_until_complete(self._conn.execute(sql))
+            self._rows = []
+            return
+        statement = self._statements.get(sql)
+        if statement is None:
+            statement = self._statements[sql] = self._loop.run_until_complete(
+                self._conn.prepare(self._numbered(sql)))
+        self._rows = self._loop.run_until_complete(statement.fetch(*params))
+    
+    def executemany(self, sql: str, rows: List[Tuple]):
+        self._loop.run_until_complete(self._conn.executemany(self._numbered(sql), rows))
+        self._rows = []
+    
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+    
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+    
+    def nextset(self):
+        return None
+    
+    def close(self):
+        pass
+
+class AsyncpgConnection:
+    """Run an asyncpg connection synchronously with psycopg-style commit()"""
+    
+    def __init__(self, loop, **connect_kwargs):
+        import asyncpg
+        self._loop = loop
+        self._conn = loop.run_until_complete(asyncpg.connect(**connect_kwargs))
+        self._begin()
+    
+    def _begin(self):
+        self._transaction = self._conn.transaction()
+        self._loop.run_until_complete(self._transaction.start())
+    
+    def cursor(self) -> AsyncpgCursor:
+        return AsyncpgCursor(self._conn, self._loop)
+    
+    def commit(self):
+        self._loop.run_until_complete(self._transaction.commit())
+        self._begin()
+    
+    def close(self):
+        self._loop.run_until_complete(self._transaction.commit())
+        self._loop.run_until_complete(self._conn.close())
+
 class BenchmarkRunner:
     def __init__(self, iterations: int = 1000, batch_size: int = 100, in_memory: bool = False, 
                  port: int = 5432, socket_dir: str = None, sqlite_only: bool = False, 
-                 pgsqlite_only: bool = False, driver: str = "psycopg2"):
+                 pgsqlite_only: bool = False, driver: str = "psycopg2", prepared: bool = False,
+                 pipeline: bool = False, pragma_tune: bool = False, cached_batch_size: int = 0,
+                 concurrency: int = 1, plain: bool = False, parallel: bool = False,
+                 json_output: bool = False, markdown_path: Optional[str] = None,
+                 batch_writes: bool = False):
         self.iterations = iterations
         self.batch_size = batch_size
         self.in_memory = in_memory
@@ -38,6 +243,16 @@ class BenchmarkRunner:
         self.sqlite_only = sqlite_only
         self.pgsqlite_only = pgsqlite_only
         self.driver = driver
+        self.prepared = prepared
+        self.pipeline = pipeline
+        self.pragma_tune = pragma_tune
+        self.cached_batch_size = cached_batch_size
+        self.concurrency = concurrency
+        self.plain = plain
+        self.parallel = parallel
+        self.json_output = json_output
+        self.markdown_path = markdown_path
+        self.batch_writes = batch_writes
         
         if socket_dir:
             # Use Unix socket
@@ -55,52 +270,322 @@ class BenchmarkRunner:
         elif driver in ["psycopg3-text", "psycopg3-binary"]:
             import psycopg
             self.psycopg = psycopg
+        elif driver == "asyncpg":
+            import asyncio
+            import asyncpg  # noqa: F401 - fail early if the driver is missing
+            self.loop = asyncio.new_event_loop()
         else:
             raise ValueError(f"Unknown driver: {driver}")
         
-        # Timing storage
-        self.sqlite_times: Dict[str, List[float]] = {
-            "CREATE": [], "INSERT": [], "UPDATE": [], "DELETE": [], "SELECT": [], "SELECT (cached)": []
-        }
-        self.pgsqlite_times: Dict[str, List[float]] = {
-            "CREATE": [], "INSERT": [], "UPDATE": [], "DELETE": [], "SELECT": [], "SELECT (cached)": []
-        }
+        # Timing storage (every operation runs at most max(iterations, 100) times)
+        capacity = max(iterations, 100)
+        self.sqlite_times = OperationTimings(OPERATIONS, capacity)
+        self.pgsqlite_times = OperationTimings(OPERATIONS + [PIPELINED, CONCURRENT], capacity)
+        
+        # Test rows drawn up front in a few vectorized calls, consumed by random_data
+        self.rng = np.random.default_rng()
+        self._rows = self.generate_rows(iterations)
+        self._next_row = 0
         
     def setup(self):
         """Remove existing database file if it exists"""
         if not self.in_memory and os.path.exists(self.sqlite_file):
             os.remove(self.sqlite_file)
     
+    def _tune_sqlite(self, conn: sqlite3.Connection):
+        """Apply the journal/sync/cache settings pgsqlite opens databases with by default"""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA mmap_size=268435456")
+    
     def random_string(self, length: int) -> str:
         """Generate random string for testing"""
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+        return random.randbytes(length).translate(ALPHANUMERIC_TABLE).decode("ascii")
+    
+    def generate_rows(self, count: int) -> List[Tuple[str, int, float, bool]]:
+        """Generate count rows of random test data with one numpy draw per column"""
+        rng = self.rng
+        count = max(count, 1)
+        text_codes = ALPHANUMERIC_CODES[rng.integers(0, len(ALPHANUMERIC_CODES), (count, 20))]
+        return list(zip(
+            [codes.tobytes().decode("ascii") for codes in text_codes],
+            rng.integers(1, 10001, count).tolist(),
+            rng.uniform(0.0, 1000.0, count).tolist(),
+            rng.integers(0, 2, count, dtype=bool).tolist()
+        ))
     
     def random_data(self) -> Tuple[str, int, float, bool]:
-        """Generate random test data"""
-        return (
-            self.random_string(20),
-            random.randint(1, 10000),
-            random.uniform(0.0, 1000.0),
-            random.choice([True, False])
-        )
+        """Return the next pre-generated test row (wrapping around when exhausted)"""
+        row = self._rows[self._next_row]
+        self._next_row = (self._next_row + 1) % len(self._rows)
+        return row
+    
+    def inline_params(self, query: str, params: Tuple, placeholder: str) -> str:
+        """Render a parameterized query with its parameters as SQL literals"""
+        for value in params:
+            if isinstance(value, str):
+                literal = "'" + value.replace("'", "''") + "'"
+            elif isinstance(value, bool):
+                literal = "TRUE" if value else "FALSE"
+            else:
+                literal = str(value)
+            query = query.replace(placeholder, literal, 1)
+        return query
+    
+    def cached_query_scripts(self, cached_queries: List[Tuple[str, Tuple]],
+                             placeholder: str) -> List[Tuple[str, int]]:
+        """Group 100 randomly chosen cached queries into (script, statement count) pairs"""
+        queries = [self.inline_params(*random.choice(cached_queries), placeholder) for _ in range(100)]
+        size = self.cached_batch_size
+        return [("; ".join(queries[i:i + size]), len(queries[i:i + size]))
+                for i in range(0, len(queries), size)]
+    
+    def execute_pgsqlite_script(self, cursor, script: str):
+        """Send a multi-statement script in one round-trip and drain its results"""
+        cursor.execute(script)
+        cursor.fetchall()
+        if self.driver != "psycopg2":
+            # psycopg3 keeps every statement's result; psycopg2 only the last one
+            while cursor.nextset():
+                cursor.fetchall()
+    
+    def flush_sqlite_batch(self, cursor, operation: Optional[str], rows: List[Tuple], data_ids: IdPool):
+        """Run buffered rows of one write operation with a single execute/executemany call"""
+        if not rows:
+            return
+        start = time.perf_counter_ns()
+        if len(rows) == 1:
+            cursor.execute(SQLITE_WRITE_SQL[operation], rows[0])
+        else:
+            cursor.executemany(SQLITE_WRITE_SQL[operation], rows)
+        elapsed = time.perf_counter_ns() - start
+        self.sqlite_times.add(operation, elapsed // len(rows), len(rows))
+        if operation == "INSERT":
+            # AUTOINCREMENT ids of one executemany call are contiguous
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            data_ids.extend(range(last_id - len(rows) + 1, last_id + 1))
+        rows.clear()
+    
+    def insert_pgsqlite_rows(self, cursor, rows: List[Tuple]) -> List[int]:
+        """Insert a batch of rows with RETURNING id and return the new ids.
+        
+        Every driver sends the same wire pattern: multi-row INSERT statements
+        of at most batch_size rows each, one round trip per page.
+        """
+        sql = PGSQLITE_WRITE_SQL["INSERT"]
+        ids = []
+        for start in range(0, len(rows), self.batch_size):
+            page = rows[start:start + self.batch_size]
+            cursor.execute(sql + ", ".join(["(%s, %s, %s, %s)"] * len(page)) + " RETURNING id",
+                           [value for row in page for value in row])
+            ids.extend(row[0] for row in cursor.fetchall())
+        return ids
+    
+    def flush_pgsqlite_batch(self, cursor, operation: Optional[str], rows: List[Tuple], data_ids: IdPool):
+        """Run buffered rows of one write operation in a single driver call"""
+        if not rows:
+            return
+        start = time.perf_counter_ns()
+        if operation == "INSERT":
+            ids = self.insert_pgsqlite_rows(cursor, rows)
+        elif len(rows) == 1:
+            cursor.execute(PGSQLITE_WRITE_SQL[operation], rows[0])
+        else:
+            cursor.executemany(PGSQLITE_WRITE_SQL[operation], rows)
+        elapsed = time.perf_counter_ns() - start
+        if operation == "INSERT":
+            data_ids.extend(ids)
+        self.pgsqlite_times.add(operation, elapsed // len(rows), len(rows))
+        rows.clear()
+    
+    def connect_pgsqlite(self):
+        """Connect to pgsqlite using the configured driver"""
+        if self.driver == "psycopg2":
+            conn = self.psycopg.connect(
+                host=self.pg_host,
+                port=self.pg_port,
+                dbname=self.pg_dbname,
+                user="dummy",  # pgsqlite doesn't use auth
+                password="dummy",
+                sslmode="disable"  # pgsqlite doesn't support SSL
+            )
+        elif self.driver in ["psycopg3-text", "psycopg3-binary"]:
+            # psycopg3 connection string
+            if self.socket_dir:
+                conninfo = f"host={self.socket_dir} port={self.pg_port} dbname={self.pg_dbname} user=dummy password=dummy sslmode=disable"
+            else:
+                conninfo = f"host={self.pg_host} port={self.pg_port} dbname={self.pg_dbname} user=dummy password=dummy sslmode=disable"
+            
+            if self.driver == "psycopg3-binary":
+                # Configure for binary mode - psycopg3 uses binary by default when beneficial
+                conn = self.psycopg.connect(conninfo)
+                # psycopg3 automatically negotiates binary format for supported types
+            else:
+                # Force text mode for psycopg3-text
+                conn = self.psycopg.connect(conninfo)
+                if hasattr(conn, 'prepare_threshold'):
+                    conn.prepare_threshold = None  # Disable prepared statements
+            
+            if self.prepared:
+                # Prepare every statement on first use so repeats send only Bind/Execute
+                conn.prepare_threshold = 0
+        elif self.driver == "asyncpg":
+            # asyncpg always uses prepared statements and binary encoding
+            conn = AsyncpgConnection(
+                self.loop,
+                host=self.pg_host,
+                port=self.pg_port,
+                database=self.pg_dbname,
+                user="dummy",
+                password="dummy",
+                ssl=False
+            )
+        return conn
+    
+    def run_pgsqlite_pipelined(self, conn, data_ids: IdPool):
+        """Replay the mixed workload in psycopg3 pipeline mode.
+        
+        Statements are queued without waiting for their results and synced once
+        per commit batch, so only whole batches are timed; each operation is
+        charged an equal share. UPDATE/DELETE/SELECT pick from ids known before
+        the batch started, and INSERT ids are collected after it syncs.
+        """
+        choice, randint = random.choice, random.randint
+        random_data, random_string = self.random_data, self.random_string
+        new_cursor = conn.cursor
+        
+        for start in range(0, self.iterations, self.batch_size):
+            count = min(self.batch_size, self.iterations - start)
+            insert_cursors = []
+            select_cursors = []
+            
+            batch_start = time.perf_counter_ns()
+            with conn.pipeline():
+                for _ in range(count):
+                    operation = choice(MIXED_OPERATIONS)
+                    cursor = new_cursor()
+                    if operation == "INSERT" or not data_ids:
+                        cursor.execute(
+                            "INSERT INTO benchmark_table_pg (text_col, int_col, real_col, bool_col) VALUES (%s, %s, %s, %s) RETURNING id",
+                            random_data()
+                        )
+                        insert_cursors.append(cursor)
+                    elif operation == "UPDATE":
+                        cursor.execute(
+                            "UPDATE benchmark_table_pg SET text_col = %s WHERE id = %s",
+                            (random_string(20), data_ids.pick())
+                        )
+                    elif operation == "DELETE":
+                        cursor.execute("DELETE FROM benchmark_table_pg WHERE id = %s",
+                                       (data_ids.pop_random(),))
+                    elif operation == "SELECT_PK":
+                        cursor.execute("SELECT * FROM benchmark_table_pg WHERE id = %s", (data_ids.pick(),))
+                        select_cursors.append(cursor)
+                    else:
+                        cursor.execute(
+                            "SELECT * FROM benchmark_table_pg WHERE int_col > %s",
+                            (randint(1, 5000),)
+                        )
+                        select_cursors.append(cursor)
+            # Leaving the pipeline block synced every queued statement
+            for cursor in select_cursors:
+                cursor.fetchall()
+            for cursor in insert_cursors:
+                data_ids.append(cursor.fetchone()[0])
+            conn.commit()
+            elapsed = time.perf_counter_ns() - batch_start
+            
+            self.pgsqlite_times.add(PIPELINED, elapsed // count, count)
     
-    def measure_time(self, func, *args, **kwargs) -> float:
-        """Measure execution time of a function"""
-        start = time.perf_counter()
-        result = func(*args, **kwargs)
-        end = time.perf_counter()
-        return end - start, result
+    def run_pgsqlite_concurrent(self):
+        """Run the mixed workload from several pgsqlite connections at once.
+        
+        Each worker thread opens its own autocommit connection and runs its
+        share of `iterations` operations on its own pre-generated rows, so
+        workers share no mutable state; the ids each one touches are the
+        ones its own INSERTs returned.
+        """
+        quotas = [len(range(worker, self.iterations, self.concurrency))
+                  for worker in range(min(self.concurrency, self.iterations))]
+        # Drawn up front on this thread: the numpy generator is not thread-safe
+        worker_rows = [self.generate_rows(quota) for quota in quotas]
+        worker_times: List[List[int]] = [[] for _ in quotas]
+        errors: List[Exception] = []
+        
+        def worker(rows: List[Tuple[str, int, float, bool]], times: List[int]):
+            data_ids = IdPool()
+            try:
+                conn = self.connect_pgsqlite()
+                conn.autocommit = True  # One transaction per operation across connections
+                cursor = conn.cursor()
+                try:
+                    for row in rows:
+                        operation = random.choice(MIXED_OPERATIONS)
+                        if operation != "INSERT" and not data_ids:
+                            operation = "INSERT"
+                        start = time.perf_counter_ns()
+                        if operation == "INSERT":
+                            cursor.execute(
+                                "INSERT INTO benchmark_table_pg (text_col, int_col, real_col, bool_col) VALUES (%s, %s, %s, %s) RETURNING id",
+                                row
+                            )
+                            data_ids.append(cursor.fetchone()[0])
+                        elif operation == "UPDATE":
+                            cursor.execute(
+                                "UPDATE benchmark_table_pg SET text_col = %s WHERE id = %s",
+                                (row[0], data_ids.pick())
+                            )
+                        elif operation == "DELETE":
+                            cursor.execute("DELETE FROM benchmark_table_pg WHERE id = %s",
+                                           (data_ids.pop_random(),))
+                        elif operation == "SELECT_PK":
+                            cursor.execute("SELECT * FROM benchmark_table_pg WHERE id = %s", (data_ids.pick(),))
+                            cursor.fetchall()
+                        else:
+                            cursor.execute(
+                                "SELECT * FROM benchmark_table_pg WHERE int_col > %s",
+                                (random.randint(1, 5000),)
+                            )
+                            cursor.fetchall()
+                        times.append(time.perf_counter_ns() - start)
+                finally:
+                    cursor.close()
+                    conn.close()
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(rows, times))
+                   for rows, times in zip(worker_rows, worker_times)]
+        wall_start = time.perf_counter_ns()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_time = (time.perf_counter_ns() - wall_start) / 1e9
+        if errors:
+            raise errors[0]
+        
+        for elapsed in itertools.chain.from_iterable(worker_times):
+            self.pgsqlite_times.add(CONCURRENT, elapsed)
+        print(f"  {self.iterations} operations on {self.concurrency} connections in {wall_time:.3f}s "
+              f"({self.iterations / wall_time:.0f} ops/s)")
     
     def run_sqlite_benchmarks(self):
         """Run benchmarks using direct SQLite access"""
         print(f"{Fore.CYAN}Running SQLite benchmarks...{Style.RESET_ALL}")
         
-        conn = sqlite3.connect(self.sqlite_file)
+        # Manage transactions explicitly (as pgsqlite's clients do) and keep every
+        # statement shape in sqlite3's statement cache
+        conn = sqlite3.connect(self.sqlite_file, cached_statements=512, isolation_level=None)
+        if self.pragma_tune:
+            self._tune_sqlite(conn)
         cursor = conn.cursor()
         
         # CREATE TABLE
-        elapsed, _ = self.measure_time(
-            cursor.execute,
+        start = time.perf_counter_ns()
+        cursor.execute(
             """CREATE TABLE IF NOT EXISTS benchmark_table (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 text_col TEXT,
@@ -109,63 +594,76 @@ class BenchmarkRunner:
                 bool_col BOOLEAN
             )"""
         )
-        self.sqlite_times["CREATE"].append(elapsed)
-        conn.commit()
+        elapsed = time.perf_counter_ns() - start
+        self.sqlite_times.add("CREATE", elapsed)
+        # Index the range-scan column so SELECT can use it (SELECT_PK uses the rowid)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_int_col ON benchmark_table (int_col)")
         
-        # Mixed operations with timing
-        data_ids = []
+        # Mixed operations with timing. With --batch-writes, consecutive writes of
+        # the same kind are buffered and flushed with one executemany call and each
+        # row is charged an equal share of the batch time; otherwise every write
+        # is flushed (and timed) on its own.
+        data_ids = IdPool()
+        pending_op, pending_rows = None, []
         
+        # Bind hot-loop lookups to locals
+        choice, randint = random.choice, random.randint
+        random_data, random_string = self.random_data, self.random_string
+        clock, flush = time.perf_counter_ns, self.flush_sqlite_batch
+        execute, fetchall = cursor.execute, cursor.fetchall
+        add_time = self.sqlite_times.add
+        batch_size, batch_writes = self.batch_size, self.batch_writes
+        
+        execute("BEGIN")
         for i in range(self.iterations):
-            operation = random.choice(["INSERT", "UPDATE", "DELETE", "SELECT"])
+            operation = choice(MIXED_OPERATIONS)
+            if operation != "INSERT" and not data_ids and pending_op != "INSERT":
+                # Nothing to work on yet (pending INSERTs get ids once flushed)
+                operation = "INSERT"
+            if operation != pending_op:
+                # Flush before switching operations so later ones see earlier writes
+                flush(cursor, pending_op, pending_rows, data_ids)
+                pending_op = None
             
-            if operation == "INSERT" or (operation in ["UPDATE", "DELETE", "SELECT"] and not data_ids):
-                # INSERT
-                data = self.random_data()
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "INSERT INTO benchmark_table (text_col, int_col, real_col, bool_col) VALUES (?, ?, ?, ?)",
-                    data
-                )
-                self.sqlite_times["INSERT"].append(elapsed)
-                data_ids.append(cursor.lastrowid)
+            if operation == "INSERT":
+                pending_op = "INSERT"
+                pending_rows.append(random_data())
+                
+            elif operation == "UPDATE":
+                pending_op = "UPDATE"
+                pending_rows.append((random_string(20), data_ids.pick()))
                 
-            elif operation == "UPDATE" and data_ids:
-                # UPDATE
-                id_to_update = random.choice(data_ids)
-                new_text = self.random_string(20)
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "UPDATE benchmark_table SET text_col = ? WHERE id = ?",
-                    (new_text, id_to_update)
-                )
-                self.sqlite_times["UPDATE"].append(elapsed)
+            elif operation == "DELETE":
+                pending_op = "DELETE"
+                pending_rows.append((data_ids.pop_random(),))
                 
-            elif operation == "DELETE" and data_ids:
-                # DELETE
-                id_to_delete = random.choice(data_ids)
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "DELETE FROM benchmark_table WHERE id = ?",
-                    (id_to_delete,)
-                )
-                self.sqlite_times["DELETE"].append(elapsed)
-                data_ids.remove(id_to_delete)
+            elif operation == "SELECT_PK":
+                # Point lookup on the primary key
+                start = clock()
+                execute("SELECT * FROM benchmark_table WHERE id = ?", (data_ids.pick(),))
+                fetchall()
+                add_time("SELECT_PK", clock() - start)
                 
-            elif operation == "SELECT" and data_ids:
-                # SELECT
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "SELECT * FROM benchmark_table WHERE int_col > ?",
-                    (random.randint(1, 5000),)
-                )
-                cursor.fetchall()  # Ensure we fetch results
-                self.sqlite_times["SELECT"].append(elapsed)
+            else:
+                # SELECT, timed through fetchall so row materialization is included
+                start = clock()
+                execute("SELECT * FROM benchmark_table WHERE int_col > ?", (randint(1, 5000),))
+                fetchall()
+                add_time("SELECT", clock() - start)
+            
+            if pending_rows and not batch_writes:
+                flush(cursor, pending_op, pending_rows, data_ids)
+                pending_op = None
             
             # Commit periodically
-            if i % self.batch_size == 0:
-                conn.commit()
+            if i % batch_size == 0:
+                flush(cursor, pending_op, pending_rows, data_ids)
+                pending_op = None
+                execute("COMMIT")
+                execute("BEGIN")
         
-        conn.commit()
+        self.flush_sqlite_batch(cursor, pending_op, pending_rows, data_ids)
+        execute("COMMIT")
         
         # Run cached query benchmarks
         print(f"{Fore.CYAN}Running SQLite cached query benchmarks...{Style.RESET_ALL}")
@@ -176,59 +674,46 @@ class BenchmarkRunner:
             ("SELECT text_col, real_col FROM benchmark_table WHERE bool_col = ?", (1,)),
             ("SELECT COUNT(*) FROM benchmark_table WHERE text_col LIKE ?", ("A%",)),
             ("SELECT AVG(real_col) FROM benchmark_table WHERE int_col BETWEEN ? AND ?", (1000, 5000)),
-            ("SELECT * FROM benchmark_table ORDER BY int_col DESC LIMIT ?", (10,))
+            ("SELECT * FROM benchmark_table ORDER BY int_col DESC LIMIT ?", (10,)),
+            ("SELECT * FROM benchmark_table WHERE id = ?", (1,))
         ]
         
         # Run each query multiple times to test caching
         for _ in range(100):
             query, params = random.choice(cached_queries)
-            elapsed, _ = self.measure_time(cursor.execute, query, params)
+            start = time.perf_counter_ns()
+            cursor.execute(query, params)
             cursor.fetchall()
-            self.sqlite_times["SELECT (cached)"].append(elapsed)
+            self.sqlite_times.add("SELECT (cached)", time.perf_counter_ns() - start)
+        
+        # Same queries batched into multi-statement scripts, one call per script.
+        # executescript steps every SELECT but hands no rows back to Python.
+        if self.cached_batch_size:
+            for script, count in self.cached_query_scripts(cached_queries, "?"):
+                start = time.perf_counter_ns()
+                conn.executescript(script)
+                elapsed = time.perf_counter_ns() - start
+                self.sqlite_times.add("SELECT (cached, batched)", elapsed // count, count)
         
         conn.close()
     
     def run_pgsqlite_benchmarks(self):
         """Run benchmarks using PostgreSQL client via pgsqlite"""
         driver_name = self.driver
+        if self.prepared and self.driver != "psycopg2":
+            driver_name += " (prepared)"
         print(f"{Fore.CYAN}Running pgsqlite benchmarks with {driver_name}...{Style.RESET_ALL}")
         if self.socket_dir:
             print(f"Connecting to pgsqlite via Unix socket: {self.socket_dir}/.s.PGSQL.{self.pg_port}")
         else:
             print(f"Connecting to pgsqlite via TCP on port {self.pg_port}")
         
-        # Connect using appropriate driver
-        if self.driver == "psycopg2":
-            conn = self.psycopg.connect(
-                host=self.pg_host,
-                port=self.pg_port,
-                dbname=self.pg_dbname,
-                user="dummy",  # pgsqlite doesn't use auth
-                password="dummy",
-                sslmode="disable"  # pgsqlite doesn't support SSL
-            )
-        elif self.driver in ["psycopg3-text", "psycopg3-binary"]:
-            # psycopg3 connection string
-            if self.socket_dir:
-                conninfo = f"host={self.socket_dir} port={self.pg_port} dbname={self.pg_dbname} user=dummy password=dummy sslmode=disable"
-            else:
-                conninfo = f"host={self.pg_host} port={self.pg_port} dbname={self.pg_dbname} user=dummy password=dummy sslmode=disable"
-            
-            if self.driver == "psycopg3-binary":
-                # Configure for binary mode - psycopg3 uses binary by default when beneficial
-                conn = self.psycopg.connect(conninfo)
-                # psycopg3 automatically negotiates binary format for supported types
-            else:
-                # Force text mode for psycopg3-text
-                conn = self.psycopg.connect(conninfo)
-                if hasattr(conn, 'prepare_threshold'):
-                    conn.prepare_threshold = None  # Disable prepared statements
-        
+        conn = self.connect_pgsqlite()
         cursor = conn.cursor()
         
         # CREATE TABLE
-        elapsed, _ = self.measure_time(
-            cursor.execute,
+        start = time.perf_counter_ns()
+        cursor.execute(
             """CREATE TABLE IF NOT EXISTS benchmark_table_pg (
                 id SERIAL PRIMARY KEY,
                 text_col TEXT,
@@ -237,64 +722,76 @@ class BenchmarkRunner:
                 bool_col BOOLEAN
             )"""
         )
-        self.pgsqlite_times["CREATE"].append(elapsed)
+        elapsed = time.perf_counter_ns() - start
+        self.pgsqlite_times.add("CREATE", elapsed)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_int_col_pg ON benchmark_table_pg (int_col)")
         conn.commit()
         
-        # Mixed operations with timing
-        data_ids = []
+        # Mixed operations with timing, writes flushed as in the SQLite run
+        data_ids = IdPool()
+        pending_op, pending_rows = None, []
+        
+        # Bind hot-loop lookups to locals
+        choice, randint = random.choice, random.randint
+        random_data, random_string = self.random_data, self.random_string
+        clock, flush = time.perf_counter_ns, self.flush_pgsqlite_batch
+        execute, fetchall = cursor.execute, cursor.fetchall
+        add_time = self.pgsqlite_times.add
+        batch_size, batch_writes = self.batch_size, self.batch_writes
         
         for i in range(self.iterations):
-            operation = random.choice(["INSERT", "UPDATE", "DELETE", "SELECT"])
+            operation = choice(MIXED_OPERATIONS)
+            if operation != "INSERT" and not data_ids and pending_op != "INSERT":
+                # Nothing to work on yet (pending INSERTs get ids once flushed)
+                operation = "INSERT"
+            if operation != pending_op:
+                # Flush before switching operations so later ones see earlier writes
+                flush(cursor, pending_op, pending_rows, data_ids)
+                pending_op = None
             
-            if operation == "INSERT" or (operation in ["UPDATE", "DELETE", "SELECT"] and not data_ids):
-                # INSERT
-                data = self.random_data()
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "INSERT INTO benchmark_table_pg (text_col, int_col, real_col, bool_col) VALUES (%s, %s, %s, %s) RETURNING id",
-                    data
-                )
-                self.pgsqlite_times["INSERT"].append(elapsed)
-                data_ids.append(cursor.fetchone()[0])
+            if operation == "INSERT":
+                pending_op = "INSERT"
+                pending_rows.append(random_data())
+                
+            elif operation == "UPDATE":
+                pending_op = "UPDATE"
+                pending_rows.append((random_string(20), data_ids.pick()))
                 
-            elif operation == "UPDATE" and data_ids:
-                # UPDATE
-                id_to_update = random.choice(data_ids)
-                new_text = self.random_string(20)
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "UPDATE benchmark_table_pg SET text_col = %s WHERE id = %s",
-                    (new_text, id_to_update)
-                )
-                self.pgsqlite_times["UPDATE"].append(elapsed)
+            elif operation == "DELETE":
+                pending_op = "DELETE"
+                pending_rows.append((data_ids.pop_random(),))
                 
-            elif operation == "DELETE" and data_ids:
-                # DELETE
-                id_to_delete = random.choice(data_ids)
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "DELETE FROM benchmark_table_pg WHERE id = %s",
-                    (id_to_delete,)
-                )
-                self.pgsqlite_times["DELETE"].append(elapsed)
-                data_ids.remove(id_to_delete)
+            elif operation == "SELECT_PK":
+                # Point lookup on the primary key
+                start = clock()
+                execute("SELECT * FROM benchmark_table_pg WHERE id = %s", (data_ids.pick(),))
+                fetchall()
+                add_time("SELECT_PK", clock() - start)
                 
-            elif operation == "SELECT" and data_ids:
-                # SELECT
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "SELECT * FROM benchmark_table_pg WHERE int_col > %s",
-                    (random.randint(1, 5000),)
-                )
-                cursor.fetchall()  # Ensure we fetch results
-                self.pgsqlite_times["SELECT"].append(elapsed)
+            else:
+                # SELECT, timed through fetchall so row materialization is included
+                start = clock()
+                execute("SELECT * FROM benchmark_table_pg WHERE int_col > %s", (randint(1, 5000),))
+                fetchall()
+                add_time("SELECT", clock() - start)
+            
+            if pending_rows and not batch_writes:
+                flush(cursor, pending_op, pending_rows, data_ids)
+                pending_op = None
             
             # Commit periodically
-            if i % self.batch_size == 0:
+            if i % batch_size == 0:
+                flush(cursor, pending_op, pending_rows, data_ids)
+                pending_op = None
                 conn.commit()
         
+        self.flush_pgsqlite_batch(cursor, pending_op, pending_rows, data_ids)
         conn.commit()
         
+        if self.pipeline:
+            print(f"{Fore.CYAN}Running pgsqlite pipelined benchmarks with {driver_name}...{Style.RESET_ALL}")
+            self.run_pgsqlite_pipelined(conn, data_ids)
+        
         # Run cached query benchmarks
         print(f"{Fore.CYAN}Running pgsqlite cached query benchmarks with {driver_name}...{Style.RESET_ALL}")
         
@@ -304,52 +801,138 @@ class BenchmarkRunner:
             ("SELECT text_col, real_col FROM benchmark_table_pg WHERE bool_col = %s", (True,)),
             ("SELECT COUNT(*) FROM benchmark_table_pg WHERE text_col LIKE %s", ("A%",)),
             ("SELECT AVG(real_col) FROM benchmark_table_pg WHERE int_col BETWEEN %s AND %s", (1000, 5000)),
-            ("SELECT * FROM benchmark_table_pg ORDER BY int_col DESC LIMIT %s", (10,))
+            ("SELECT * FROM benchmark_table_pg ORDER BY int_col DESC LIMIT %s", (10,)),
+            ("SELECT * FROM benchmark_table_pg WHERE id = %s", (1,))
         ]
         
         # Run each query multiple times to test caching
         for _ in range(100):
             query, params = random.choice(cached_queries)
-            elapsed, _ = self.measure_time(cursor.execute, query, params)
+            start = time.perf_counter_ns()
+            cursor.execute(query, params)
             cursor.fetchall()
-            self.pgsqlite_times["SELECT (cached)"].append(elapsed)
+            self.pgsqlite_times.add("SELECT (cached)", time.perf_counter_ns() - start)
+        
+        # Same queries batched into multi-statement scripts, one round-trip per script
+        if self.cached_batch_size:
+            for script, count in self.cached_query_scripts(cached_queries, "%s"):
+                start = time.perf_counter_ns()
+                self.execute_pgsqlite_script(cursor, script)
+                elapsed = time.perf_counter_ns() - start
+                self.pgsqlite_times.add("SELECT (cached, batched)", elapsed // count, count)
         
         cursor.close()
         conn.close()
         
-    def calculate_stats(self, times: List[float]) -> Dict[str, float]:
-        """Calculate statistics for a list of times"""
-        if not times:
+        if self.concurrency > 1:
+            print(f"{Fore.CYAN}Running pgsqlite concurrent benchmarks with {driver_name} "
+                  f"on {self.concurrency} connections...{Style.RESET_ALL}")
+            self.run_pgsqlite_concurrent()
+        
+    def calculate_stats(self, times: np.ndarray) -> Dict[str, float]:
+        """Calculate statistics for an array of times"""
+        if len(times) == 0:
             return {"avg": 0, "min": 0, "max": 0, "median": 0, "total": 0}
         
         return {
-            "avg": statistics.mean(times),
-            "min": min(times),
-            "max": max(times),
-            "median": statistics.median(times),
-            "total": sum(times)
+            "avg": float(times.mean()),
+            "min": float(times.min()),
+            "max": float(times.max()),
+            "median": float(np.median(times)),
+            "total": float(times.sum())
         }
     
+    def collect_results(self, include_samples: bool = False) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Compute stats once per (engine, operation) that recorded samples.
+        
+        Returns {"sqlite": {op: stats}, "pgsqlite": {op: stats}} where stats
+        holds the count plus calculate_stats() figures in seconds, and the raw
+        nanosecond samples plus the per-span (total_ns, count) pairs when
+        include_samples is set.
+        """
+        results = {}
+        for engine, timings in (("sqlite", self.sqlite_times), ("pgsqlite", self.pgsqlite_times)):
+            engine_results = results[engine] = {}
+            for operation in timings.operations:
+                samples = timings.samples_ns(operation)
+                if len(samples) == 0:
+                    continue
+                stats = self.calculate_stats(samples / 1e9)
+                stats["count"] = len(samples)
+                if include_samples:
+                    stats["samples_ns"] = samples.tolist()
+                    stats["spans_ns"] = timings.spans_ns(operation)
+                engine_results[operation] = stats
+        return results
+    
+    def print_json(self):
+        """Print results as one JSON object for CI and run-to-run comparison"""
+        results = self.collect_results(include_samples=True)
+        sqlite_count, total_sqlite = self.sqlite_times.totals(OPERATIONS)
+        pgsqlite_count, total_pgsqlite = self.pgsqlite_times.totals(OPERATIONS)
+        print(json.dumps({
+            "schema": 1,
+            "driver": self.driver,
+            "iterations": self.iterations,
+            "batch_size": self.batch_size,
+            "batch_writes": self.batch_writes,
+            "results": results,
+            "totals": {
+                "sqlite": {"count": sqlite_count, "total": total_sqlite},
+                "pgsqlite": {"count": pgsqlite_count, "total": total_pgsqlite},
+            },
+        }, default=float))
+    
+    def write_markdown(self, summary_data: List[List[Any]], headers: List[str]):
+        """Write the summary table as Markdown so saved results come straight from a run"""
+        from tabulate import tabulate
+        mode = "in-memory" if self.in_memory else "file-based"
+        with open(self.markdown_path, "w") as f:
+            f.write("# Benchmark Results\n\n")
+            writes = ", batched writes" if self.batch_writes else ""
+            f.write(f"Driver: {self.driver}, iterations: {self.iterations}, "
+                    f"batch size: {self.batch_size}, {mode}{writes}\n\n")
+            f.write(tabulate(summary_data, headers=headers, tablefmt="github", disable_numparse=True))
+            f.write("\n")
+        print(f"Results table written to {self.markdown_path}")
+    
     def print_results(self):
         """Print benchmark results"""
+        # Build the whole report first and write it in one go, instead of one
+        # locked, flushed write per line
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            self._print_report()
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+    
+    def _print_report(self):
+        """Print the results tables and summaries"""
+        results = self.collect_results()
+        empty = dict(self.calculate_stats(np.empty(0)), count=0)
+        sqlite_results, pgsqlite_results = results["sqlite"], results["pgsqlite"]
+        
         print(f"\n{Fore.GREEN}{'='*80}{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}BENCHMARK RESULTS{Style.RESET_ALL}")
         print(f"{Fore.GREEN}{'='*80}{Style.RESET_ALL}")
         
         if self.driver != "psycopg2":
             print(f"{Fore.CYAN}Driver: {self.driver}{Style.RESET_ALL}")
+        if self.batch_writes:
+            print(f"{Fore.CYAN}INSERT/UPDATE/DELETE: batched (per-row share of each "
+                  f"executemany call){Style.RESET_ALL}")
         
         # Summary table
         summary_data = []
         
         if self.sqlite_only:
             # SQLite-only table
-            for operation in ["CREATE", "INSERT", "UPDATE", "DELETE", "SELECT", "SELECT (cached)"]:
-                sqlite_stats = self.calculate_stats(self.sqlite_times[operation])
-                if len(self.sqlite_times[operation]) > 0:
+            for operation in OPERATIONS:
+                sqlite_stats = sqlite_results.get(operation, empty)
+                if operation in sqlite_results:
                     summary_data.append([
                         operation,
-                        len(self.sqlite_times[operation]),
+                        sqlite_stats['count'],
                         f"{sqlite_stats['avg']*1000:.3f}",
                         f"{sqlite_stats['min']*1000:.3f}",
                         f"{sqlite_stats['max']*1000:.3f}",
@@ -360,12 +943,12 @@ class BenchmarkRunner:
         
         elif self.pgsqlite_only:
             # pgSQLite-only table
-            for operation in ["CREATE", "INSERT", "UPDATE", "DELETE", "SELECT", "SELECT (cached)"]:
-                pgsqlite_stats = self.calculate_stats(self.pgsqlite_times[operation])
-                if len(self.pgsqlite_times[operation]) > 0:
+            for operation in OPERATIONS + [PIPELINED, CONCURRENT]:
+                pgsqlite_stats = pgsqlite_results.get(operation, empty)
+                if operation in pgsqlite_results:
                     summary_data.append([
                         operation,
-                        len(self.pgsqlite_times[operation]),
+                        pgsqlite_stats['count'],
                         f"{pgsqlite_stats['avg']*1000:.3f}",
                         f"{pgsqlite_stats['min']*1000:.3f}",
                         f"{pgsqlite_stats['max']*1000:.3f}",
@@ -376,9 +959,11 @@ class BenchmarkRunner:
         
         else:
             # Full comparison table
-            for operation in ["CREATE", "INSERT", "UPDATE", "DELETE", "SELECT", "SELECT (cached)"]:
-                sqlite_stats = self.calculate_stats(self.sqlite_times[operation])
-                pgsqlite_stats = self.calculate_stats(self.pgsqlite_times[operation])
+            for operation in OPERATIONS:
+                if operation not in sqlite_results and operation not in pgsqlite_results:
+                    continue  # Optional phase that wasn't run
+                sqlite_stats = sqlite_results.get(operation, empty)
+                pgsqlite_stats = pgsqlite_results.get(operation, empty)
                 
                 if sqlite_stats["avg"] > 0:
                     overhead = ((pgsqlite_stats["avg"] - sqlite_stats["avg"]) / sqlite_stats["avg"]) * 100
@@ -389,7 +974,7 @@ class BenchmarkRunner:
                 
                 summary_data.append([
                     operation,
-                    len(self.sqlite_times[operation]),
+                    sqlite_stats['count'],
                     f"{sqlite_stats['avg']*1000:.3f}",
                     f"{pgsqlite_stats['avg']*1000:.3f}",
                     f"{diff_ms:+.3f}",
@@ -398,18 +983,42 @@ class BenchmarkRunner:
                     f"{pgsqlite_stats['total']:.3f}"
                 ])
             
+            for operation in [PIPELINED, CONCURRENT]:
+                if operation not in pgsqlite_results:
+                    continue
+                # No SQLite counterpart; compare against the pgsqlite per-op figures instead
+                pgsqlite_stats = pgsqlite_results.get(operation, empty)
+                summary_data.append([
+                    operation,
+                    pgsqlite_stats['count'],
+                    "-",
+                    f"{pgsqlite_stats['avg']*1000:.3f}",
+                    "-",
+                    "-",
+                    "-",
+                    f"{pgsqlite_stats['total']:.3f}"
+                ])
+            
             headers = ["Operation", "Count", "SQLite Avg (ms)", "pgsqlite Avg (ms)", 
                        "Diff (ms)", "Overhead", "SQLite Total (s)", "pgsqlite Total (s)"]
         
-        print(tabulate(summary_data, headers=headers, tablefmt="grid"))
+        if self.plain:
+            print(format_plain_table(summary_data, headers))
+        else:
+            # Only pulled in for the interactive grid output
+            from tabulate import tabulate
+            print(tabulate(summary_data, headers=headers, tablefmt="grid"))
+        
+        if self.markdown_path:
+            self.write_markdown(summary_data, headers)
         
         # Per-operation difference summary (only for full comparison)
         if not self.sqlite_only and not self.pgsqlite_only:
             print(f"\n{Fore.CYAN}Per-Operation Time Differences:{Style.RESET_ALL}")
-            for operation in ["CREATE", "INSERT", "UPDATE", "DELETE", "SELECT", "SELECT (cached)"]:
-                sqlite_stats = self.calculate_stats(self.sqlite_times[operation])
-                pgsqlite_stats = self.calculate_stats(self.pgsqlite_times[operation])
-                if len(self.sqlite_times[operation]) > 0:
+            for operation in OPERATIONS:
+                sqlite_stats = sqlite_results.get(operation, empty)
+                pgsqlite_stats = pgsqlite_results.get(operation, empty)
+                if operation in sqlite_results:
                     diff_ms = (pgsqlite_stats['avg'] - sqlite_stats['avg']) * 1000
                     print(f"{operation}: {diff_ms:+.3f}ms ({Fore.GREEN if diff_ms < 0 else Fore.RED}{diff_ms:+.3f}ms{Style.RESET_ALL} avg difference per call)")
         
@@ -417,40 +1026,36 @@ class BenchmarkRunner:
         print(f"\n{Fore.CYAN}Overall Statistics:{Style.RESET_ALL}")
         
         if self.sqlite_only:
-            all_sqlite_times = sum(self.sqlite_times.values(), [])
-            total_sqlite = sum(all_sqlite_times)
-            print(f"Total operations: {len(all_sqlite_times)}")
+            sqlite_count, total_sqlite = self.sqlite_times.totals(OPERATIONS)
+            print(f"Total operations: {sqlite_count}")
             print(f"Total SQLite time: {total_sqlite:.3f}s")
             
         elif self.pgsqlite_only:
-            all_pgsqlite_times = sum(self.pgsqlite_times.values(), [])
-            total_pgsqlite = sum(all_pgsqlite_times)
-            print(f"Total operations: {len(all_pgsqlite_times)}")
+            pgsqlite_count, total_pgsqlite = self.pgsqlite_times.totals(OPERATIONS)
+            print(f"Total operations: {pgsqlite_count}")
             print(f"Total pgSQLite time: {total_pgsqlite:.3f}s")
             
         else:
-            all_sqlite_times = sum(self.sqlite_times.values(), [])
-            all_pgsqlite_times = sum(self.pgsqlite_times.values(), [])
-            total_sqlite = sum(all_sqlite_times)
-            total_pgsqlite = sum(all_pgsqlite_times)
-            print(f"Total operations: {len(all_sqlite_times)}")
+            sqlite_count, total_sqlite = self.sqlite_times.totals(OPERATIONS)
+            _, total_pgsqlite = self.pgsqlite_times.totals(OPERATIONS)
+            print(f"Total operations: {sqlite_count}")
             print(f"Total SQLite time: {total_sqlite:.3f}s")
             print(f"Total pgsqlite time: {total_pgsqlite:.3f}s")
             if total_sqlite > 0:
                 print(f"Overall overhead: {((total_pgsqlite - total_sqlite) / total_sqlite * 100):+.1f}%")
             
             # Cache effectiveness analysis
-            if len(self.sqlite_times["SELECT"]) > 0 and len(self.sqlite_times["SELECT (cached)"]) > 0:
+            if "SELECT" in sqlite_results and "SELECT (cached)" in sqlite_results:
                 print(f"\n{Fore.CYAN}Cache Effectiveness Analysis:{Style.RESET_ALL}")
                 
                 # SQLite cached performance
-                sqlite_uncached = self.calculate_stats(self.sqlite_times["SELECT"])
-                sqlite_cached = self.calculate_stats(self.sqlite_times["SELECT (cached)"])
+                sqlite_uncached = sqlite_results.get("SELECT", empty)
+                sqlite_cached = sqlite_results.get("SELECT (cached)", empty)
                 sqlite_cache_speedup = sqlite_uncached['avg'] / sqlite_cached['avg'] if sqlite_cached['avg'] > 0 else 1
                 
                 # pgsqlite cached performance
-                pgsqlite_uncached = self.calculate_stats(self.pgsqlite_times["SELECT"])
-                pgsqlite_cached = self.calculate_stats(self.pgsqlite_times["SELECT (cached)"])
+                pgsqlite_uncached = pgsqlite_results.get("SELECT", empty)
+                pgsqlite_cached = pgsqlite_results.get("SELECT (cached)", empty)
                 pgsqlite_cache_speedup = pgsqlite_uncached['avg'] / pgsqlite_cached['avg'] if pgsqlite_cached['avg'] > 0 else 1
                 
                 print(f"SQLite cache speedup: {sqlite_cache_speedup:.1f}x")
@@ -458,16 +1063,32 @@ class BenchmarkRunner:
         
     def run(self):
         """Run the complete benchmark suite"""
-        self.setup()
+        # With --json, progress messages go to stderr so stdout carries only the JSON object
+        progress = contextlib.redirect_stdout(sys.stderr) if self.json_output else contextlib.nullcontext()
+        with progress:
+            self.setup()
         
         try:
-            if not self.pgsqlite_only:
-                self.run_sqlite_benchmarks()
-            if not self.sqlite_only:
-                self.run_pgsqlite_benchmarks()
-            self.print_results()
+            with progress:
+                if self.parallel and not self.sqlite_only and not self.pgsqlite_only:
+                    # Each engine has its own connection, ids and timing store; sqlite3 and
+                    # socket I/O release the GIL, so the two runs genuinely overlap
+                    with ThreadPoolExecutor(max_workers=2) as executor:
+                        futures = [executor.submit(self.run_sqlite_benchmarks),
+                                   executor.submit(self.run_pgsqlite_benchmarks)]
+                        for future in futures:
+                            future.result()
+                else:
+                    if not self.pgsqlite_only:
+                        self.run_sqlite_benchmarks()
+                    if not self.sqlite_only:
+                        self.run_pgsqlite_benchmarks()
+            if self.json_output:
+                self.print_json()
+            else:
+                self.print_results()
         except Exception as e:
-            print(f"{Fore.RED}Error during benchmark: {e}{Style.RESET_ALL}")
+            print(f"{Fore.RED}Error during benchmark: {e}{Style.RESET_ALL}", file=sys.stderr)
             raise
 
 def main():
@@ -490,14 +1111,45 @@ def main():
     parser.add_argument("--pgsqlite-only", action="store_true",
                         help="Run only pgSQLite benchmarks")
     parser.add_argument("--driver", type=str, default="psycopg2",
-                        choices=["psycopg2", "psycopg3-text", "psycopg3-binary"],
+                        choices=["psycopg2", "psycopg3-text", "psycopg3-binary", "asyncpg"],
                         help="PostgreSQL driver to use (default: psycopg2)")
     
+    parser.add_argument("--prepared", action="store_true",
+                        help="Use server-side prepared statements for every query (psycopg3 drivers only)")
+    parser.add_argument("--pragma-tune", action="store_true",
+                        help="Tune SQLite with the PRAGMAs pgsqlite uses by default (WAL, synchronous=NORMAL, 64MB cache, mmap)")
+    parser.add_argument("--cached-batch-size", type=int, default=0,
+                        help="Also run the cached queries as multi-statement scripts of this size (default: off)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Also run the mixed workload on this many concurrent pgsqlite connections (default: 1, off)")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run the SQLite and pgsqlite benchmarks concurrently")
+    parser.add_argument("--plain", action="store_true",
+                        help="Print the results table as fixed-width plain text instead of a tabulate grid")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Also replay the mixed workload in pipeline mode (psycopg3 drivers only)")
+    parser.add_argument("--markdown", type=str, default=None, metavar="PATH",
+                        help="Also write the results table as Markdown to PATH")
+    parser.add_argument("--batch-writes", action="store_true",
+                        help="Buffer consecutive INSERT/UPDATE/DELETE and time them as batches, "
+                             "charging each row an equal share (default: one statement per write)")
+    parser.add_argument("--json", action="store_true",
+                        help="Print results (stats and raw ns samples) as a single JSON object instead of tables")
+    
     args = parser.parse_args()
     
     # Validate mutually exclusive options
     if args.sqlite_only and args.pgsqlite_only:
         parser.error("Cannot specify both --sqlite-only and --pgsqlite-only")
+    if args.prepared and args.driver not in ["psycopg3-text", "psycopg3-binary"]:
+        # psycopg2 only prepares via SQL PREPARE/EXECUTE, which pgsqlite does not support;
+        # asyncpg always prepares
+        parser.error("--prepared requires a psycopg3 driver")
+    if args.concurrency > 1 and args.driver == "asyncpg":
+        # The asyncpg adapter drives a single event loop from the main thread
+        parser.error("--concurrency is not supported with asyncpg")
+    if args.pipeline and args.driver not in ["psycopg3-text", "psycopg3-binary"]:
+        parser.error("--pipeline requires a psycopg3 driver")
     
     # Default to in-memory mode unless --file-based is specified
     in_memory = not args.file_based
@@ -505,7 +1157,11 @@ def main():
     runner = BenchmarkRunner(iterations=args.iterations, batch_size=args.batch_size, 
                            in_memory=in_memory, port=args.port, socket_dir=args.socket_dir,
                            sqlite_only=args.sqlite_only, pgsqlite_only=args.pgsqlite_only,
-                           driver=args.driver)
+                           driver=args.driver, prepared=args.prepared, pipeline=args.pipeline,
+                           pragma_tune=args.pragma_tune, cached_batch_size=args.cached_batch_size,
+                           concurrency=args.concurrency, plain=args.plain,
+                           parallel=args.parallel, json_output=args.json,
+                           markdown_path=args.markdown, batch_writes=args.batch_writes)
     runner.run()
 
 if __name__ == "__main__":
@@ -3,15 +3,55 @@
 Benchmark specifically for INSERT with RETURNING operations
 """
 
+import os
 import time
-import psycopg2
+import numpy as np
+import psycopg
 import sqlite3
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from tabulate import tabulate
 from colorama import init, Fore, Style
 
 init(autoreset=True)
 
+# "latency" times every INSERT on its own; "batch" sends all rows in a few calls inside
+# one transaction and reports the per-row share, i.e. throughput; "pipeline" streams
+# the per-row INSERTs to pgsqlite in psycopg3 pipeline mode (SQLite has no protocol
+# to pipeline, so it runs the batch path to report throughput as well)
+BENCH_MODE = os.environ.get("BENCH_MODE", "latency")
+
+# In latency mode a COMMIT is issued every COMMIT_BATCH rows, the way an app grouping
+# its writes would; commits are timed on their own so they neither hide nor land
+# in the per-INSERT samples (whose p99/max they would otherwise dominate)
+COMMIT_BATCH = 50
+
+# Discarded INSERTs run before timing so the first timed rows don't pay for
+# cold statement caches and schema lookups
+WARMUP_ROWS = 20
+
+# Rows per multi-row INSERT in pgsqlite batch mode; one statement carrying every
+# row would pass the protocol's 65535 bind-parameter limit above 32767 rows
+BATCH_PAGE_ROWS = 100
+
+def percentiles(times):
+    """p50, p90 and p99 of the per-row times (a single sample is its own percentiles)"""
+    return tuple(float(q) for q in np.percentile(times, [50, 90, 99]))
+
+def batch_times(start, end, iterations):
+    """Spread one batch's elapsed time evenly over its rows, in ms.
+
+    Returns (insert_times, commit_times) like the latency loops; the batch's
+    single commit is part of its elapsed time, so commit_times is empty.
+    """
+    return [(end - start) / 1e6 / iterations] * iterations, []
+
+def timed_commit(conn, commit_times):
+    """Commit and record how long it took, in ms"""
+    start = time.perf_counter_ns()
+    conn.commit()
+    commit_times.append((time.perf_counter_ns() - start) / 1e6)
+
 def benchmark_sqlite_insert_returning(conn, iterations):
     """Benchmark SQLite INSERT with RETURNING (simulated)"""
     cursor = conn.cursor()
@@ -26,21 +66,40 @@ def benchmark_sqlite_insert_returning(conn, iterations):
     """)
     conn.commit()
     
+    # Built before any timing so string formatting is not counted as INSERT time
+    params = [(f"test_{i}", i) for i in range(iterations)]
+    
+    for i in range(WARMUP_ROWS):
+        cursor.execute("INSERT INTO test_returning (name, value) VALUES (?, ?)", ("warmup", -i))
+        row_id = cursor.lastrowid
+    cursor.execute("DELETE FROM test_returning WHERE name = 'warmup'")
+    conn.commit()
+    
+    if BENCH_MODE in ("batch", "pipeline"):
+        start = time.perf_counter_ns()
+        cursor.executemany("INSERT INTO test_returning (name, value) VALUES (?, ?)", params)
+        conn.commit()
+        end = time.perf_counter_ns()
+        return batch_times(start, end, iterations)
+    
     # Benchmark INSERT operations
     insert_times = []
-    for i in range(iterations):
-        start = time.perf_counter()
+    commit_times = []
+    for i, row in enumerate(params, 1):
+        start = time.perf_counter_ns()
         cursor.execute(
             "INSERT INTO test_returning (name, value) VALUES (?, ?)",
-            (f"test_{i}", i)
+            row
         )
         # Simulate RETURNING by fetching lastrowid
         row_id = cursor.lastrowid
-        end = time.perf_counter()
-        insert_times.append((end - start) * 1000)  # Convert to ms
+        end = time.perf_counter_ns()
+        insert_times.append((end - start) / 1e6)  # Convert to ms
+        if i % COMMIT_BATCH == 0:
+            timed_commit(conn, commit_times)
     
     conn.commit()
-    return insert_times
+    return insert_times, commit_times
 
 def benchmark_pgsqlite_insert_returning(conn, iterations):
     """Benchmark pgsqlite INSERT with RETURNING"""
@@ -56,54 +115,131 @@ def benchmark_pgsqlite_insert_returning(conn, iterations):
     """)
     conn.commit()
     
+    # Built before any timing so string formatting is not counted as INSERT time
+    params = [(f"test_{i}", i) for i in range(iterations)]
+    
+    for i in range(WARMUP_ROWS):
+        cursor.execute("INSERT INTO test_returning (name, value) VALUES (%s, %s) RETURNING id", ("warmup", -i))
+        row_id = cursor.fetchone()[0]
+    cursor.execute("DELETE FROM test_returning WHERE name = 'warmup'")
+    conn.commit()
+    
+    if BENCH_MODE == "batch":
+        # Multi-row INSERTs of BATCH_PAGE_ROWS rows that still return every id;
+        # statements and flat parameter lists are built before the timer starts
+        pages = []
+        for first in range(0, iterations, BATCH_PAGE_ROWS):
+            page = params[first:first + BATCH_PAGE_ROWS]
+            pages.append(("INSERT INTO test_returning (name, value) VALUES "
+                          + ", ".join(["(%s, %s)"] * len(page)) + " RETURNING id",
+                          [value for row in page for value in row]))
+        row_ids = []
+        start = time.perf_counter_ns()
+        for batch_sql, batch_params in pages:
+            cursor.execute(batch_sql, batch_params)
+            row_ids += cursor.fetchall()
+        conn.commit()
+        end = time.perf_counter_ns()
+        return batch_times(start, end, iterations)
+    
+    if BENCH_MODE == "pipeline":
+        start = time.perf_counter_ns()
+        # One cursor per statement so every RETURNING result is kept until the sync;
+        # prepare=True parses the INSERT once and only binds + executes afterwards
+        cursors = []
+        with conn.pipeline():
+            for row in params:
+                pipelined = conn.cursor()
+                pipelined.execute(
+                    "INSERT INTO test_returning (name, value) VALUES (%s, %s) RETURNING id", row,
+                    prepare=True)
+                cursors.append(pipelined)
+        row_ids = [pipelined.fetchone()[0] for pipelined in cursors]
+        conn.commit()
+        end = time.perf_counter_ns()
+        return batch_times(start, end, iterations)
+    
     # Benchmark INSERT with RETURNING operations
     insert_times = []
-    for i in range(iterations):
-        start = time.perf_counter()
+    commit_times = []
+    for i, row in enumerate(params, 1):
+        start = time.perf_counter_ns()
         cursor.execute(
             "INSERT INTO test_returning (name, value) VALUES (%s, %s) RETURNING id",
-            (f"test_{i}", i)
+            row
         )
         row_id = cursor.fetchone()[0]
-        end = time.perf_counter()
-        insert_times.append((end - start) * 1000)  # Convert to ms
+        end = time.perf_counter_ns()
+        insert_times.append((end - start) / 1e6)  # Convert to ms
+        if i % COMMIT_BATCH == 0:
+            timed_commit(conn, commit_times)
     
     conn.commit()
-    return insert_times
+    return insert_times, commit_times
+
+def run_sqlite(iterations):
+    """Run the SQLite side on its own in-memory connection"""
+    sqlite_conn = sqlite3.connect(':memory:')
+    try:
+        return benchmark_sqlite_insert_returning(sqlite_conn, iterations)
+    finally:
+        sqlite_conn.close()
+
+def run_pgsqlite(port, iterations):
+    """Run the pgsqlite side on its own connection"""
+    pg_conn = psycopg.connect(
+        host='localhost',
+        port=port,
+        dbname=':memory:',
+        user='dummy'
+    )
+    try:
+        return benchmark_pgsqlite_insert_returning(pg_conn, iterations)
+    finally:
+        pg_conn.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Benchmark INSERT with RETURNING')
     parser.add_argument('--iterations', type=int, default=1000, help='Number of iterations')
     parser.add_argument('--port', type=int, default=5432, help='pgsqlite port')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Run the SQLite and pgsqlite sides in separate processes at the same time '
+                             '(shorter wall time, but the two compete for CPU)')
     args = parser.parse_args()
     
+    if BENCH_MODE not in ("latency", "batch", "pipeline"):
+        parser.error(f"BENCH_MODE must be 'latency', 'batch' or 'pipeline', got {BENCH_MODE!r}")
+    
     print(f"{Fore.CYAN}{'='*80}")
     print(f"INSERT WITH RETURNING BENCHMARK")
     print(f"Iterations: {args.iterations}")
+    print(f"Mode: {BENCH_MODE}")
+    if BENCH_MODE == "latency":
+        print(f"Commit every: {COMMIT_BATCH} rows")
     print(f"{'='*80}{Style.RESET_ALL}")
     
-    # SQLite benchmark
-    print(f"\n{Fore.YELLOW}Running SQLite benchmark...{Style.RESET_ALL}")
-    sqlite_conn = sqlite3.connect(':memory:')
-    sqlite_times = benchmark_sqlite_insert_returning(sqlite_conn, args.iterations)
+    if args.parallel:
+        print(f"\n{Fore.YELLOW}Running SQLite and pgsqlite benchmarks in parallel...{Style.RESET_ALL}")
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            sqlite_future = executor.submit(run_sqlite, args.iterations)
+            pgsqlite_future = executor.submit(run_pgsqlite, args.port, args.iterations)
+            sqlite_times, sqlite_commits = sqlite_future.result()
+            pgsqlite_times, pgsqlite_commits = pgsqlite_future.result()
+    else:
+        print(f"\n{Fore.YELLOW}Running SQLite benchmark...{Style.RESET_ALL}")
+        sqlite_times, sqlite_commits = run_sqlite(args.iterations)
+        print(f"{Fore.YELLOW}Running pgsqlite benchmark...{Style.RESET_ALL}")
+        pgsqlite_times, pgsqlite_commits = run_pgsqlite(args.port, args.iterations)
+    
     sqlite_avg = sum(sqlite_times) / len(sqlite_times)
+    sqlite_p50, sqlite_p90, sqlite_p99 = percentiles(sqlite_times)
     sqlite_min = min(sqlite_times)
     sqlite_max = max(sqlite_times)
-    sqlite_conn.close()
     
-    # pgsqlite benchmark
-    print(f"{Fore.YELLOW}Running pgsqlite benchmark...{Style.RESET_ALL}")
-    pg_conn = psycopg2.connect(
-        host='localhost',
-        port=args.port,
-        database=':memory:',
-        user='dummy'
-    )
-    pgsqlite_times = benchmark_pgsqlite_insert_returning(pg_conn, args.iterations)
     pgsqlite_avg = sum(pgsqlite_times) / len(pgsqlite_times)
+    pgsqlite_p50, pgsqlite_p90, pgsqlite_p99 = percentiles(pgsqlite_times)
     pgsqlite_min = min(pgsqlite_times)
     pgsqlite_max = max(pgsqlite_times)
-    pg_conn.close()
     
     # Calculate overhead
     overhead = ((pgsqlite_avg - sqlite_avg) / sqlite_avg) * 100
@@ -113,6 +249,12 @@ def main():
         ["Metric", "SQLite", "pgsqlite", "Difference", "Overhead"],
         ["Average (ms)", f"{sqlite_avg:.4f}", f"{pgsqlite_avg:.4f}", 
          f"{pgsqlite_avg - sqlite_avg:.4f}", f"{overhead:+.1f}%"],
+        ["p50 (ms)", f"{sqlite_p50:.4f}", f"{pgsqlite_p50:.4f}",
+         f"{pgsqlite_p50 - sqlite_p50:.4f}", f"{(pgsqlite_p50 - sqlite_p50) / sqlite_p50 * 100:+.1f}%"],
+        ["p90 (ms)", f"{sqlite_p90:.4f}", f"{pgsqlite_p90:.4f}",
+         f"{pgsqlite_p90 - sqlite_p90:.4f}", ""],
+        ["p99 (ms)", f"{sqlite_p99:.4f}", f"{pgsqlite_p99:.4f}",
+         f"{pgsqlite_p99 - sqlite_p99:.4f}", ""],
         ["Min (ms)", f"{sqlite_min:.4f}", f"{pgsqlite_min:.4f}", 
          f"{pgsqlite_min - sqlite_min:.4f}", ""],
         ["Max (ms)", f"{sqlite_max:.4f}", f"{pgsqlite_max:.4f}", 
@@ -120,6 +262,13 @@ def main():
         ["Total (s)", f"{sum(sqlite_times)/1000:.3f}", f"{sum(pgsqlite_times)/1000:.3f}",
          f"{(sum(pgsqlite_times) - sum(sqlite_times))/1000:.3f}", ""],
     ]
+    if sqlite_commits and pgsqlite_commits:
+        # Latency mode: commits every COMMIT_BATCH rows, kept out of the INSERT rows above
+        sqlite_commit = sum(sqlite_commits) / len(sqlite_commits)
+        pgsqlite_commit = sum(pgsqlite_commits) / len(pgsqlite_commits)
+        results.append([f"Commit / {COMMIT_BATCH} rows (ms)", f"{sqlite_commit:.4f}", f"{pgsqlite_commit:.4f}",
+                        f"{pgsqlite_commit - sqlite_commit:.4f}",
+                        f"{(pgsqlite_commit - sqlite_commit) / sqlite_commit * 100:+.1f}%"])
     
     print(f"\n{Fore.GREEN}RESULTS:{Style.RESET_ALL}")
     print(tabulate(results, headers="firstrow", tablefmt="grid"))
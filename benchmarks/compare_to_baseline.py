@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark_drivers.py --json runs and flag per-operation regressions.
+
+For every (engine, operation) present in both files this prints the
+new/baseline mean ratio and a Welch's t-test p-value over one sample per
+timed span (a batch counts once, as its per-statement average).
+The exit status is 1 if any operation is slower than --max-ratio with
+p < --alpha, so it can gate CI.
+"""
+
+import json
+import math
+import sys
+from typing import Any, Dict
+
+import numpy as np
+from colorama import init, Fore, Style
+from tabulate import tabulate
+
+# Use scipy's t distribution when available, otherwise a normal approximation
+# (the benchmark produces hundreds of samples per operation, where they agree)
+try:
+    from scipy.stats import t as t_dist
+
+    def two_sided_p(t_stat: float, dof: float) -> float:
+        return float(2 * t_dist.sf(abs(t_stat), dof))
+except ImportError:
+    def two_sided_p(t_stat: float, dof: float) -> float:
+        return math.erfc(abs(t_stat) / math.sqrt(2))
+
+init()
+
+
+def welch_t_test(new: np.ndarray, old: np.ndarray) -> float:
+    """Two-sided p-value of Welch's t-test for a difference in means"""
+    if len(new) < 2 or len(old) < 2:
+        return 1.0
+    var_new, var_old = new.var(ddof=1) / len(new), old.var(ddof=1) / len(old)
+    se = math.sqrt(var_new + var_old)
+    if se == 0:
+        return 0.0 if new.mean() != old.mean() else 1.0
+    t_stat = (new.mean() - old.mean()) / se
+    dof = (var_new + var_old) ** 2 / (
+        var_new ** 2 / (len(new) - 1) + var_old ** 2 / (len(old) - 1))
+    return two_sided_p(t_stat, dof)
+
+
+def span_samples(stats: Dict[str, Any]) -> np.ndarray:
+    """Per-statement ns average of every timed span of one operation.
+
+    Batched operations record count copies of the same batch average in
+    samples_ns; testing on those would inflate n by the batch size and
+    collapse the variance. Files without spans_ns fall back to collapsing
+    runs of identical consecutive samples.
+    """
+    if "spans_ns" in stats:
+        spans = np.asarray(stats["spans_ns"], dtype=np.float64).reshape(-1, 2)
+        return spans[:, 0] / spans[:, 1]
+    samples = np.asarray(stats["samples_ns"], dtype=np.float64)
+    if len(samples) == 0:
+        return samples
+    return samples[np.r_[True, samples[1:] != samples[:-1]]]
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare benchmark_drivers.py --json output against a baseline")
+    parser.add_argument("baseline", help="JSON results of the reference run")
+    parser.add_argument("results", help="JSON results of the run to check")
+    parser.add_argument("--max-ratio", type=float, default=1.05,
+                        help="Mean slowdown tolerated before flagging a regression (default: 1.05)")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="Significance level for the regression check (default: 0.05)")
+    args = parser.parse_args()
+
+    baseline_run, new_run = load_results(args.baseline), load_results(args.results)
+    if baseline_run.get("batch_writes", False) != new_run.get("batch_writes", False):
+        # Batched writes charge each row a share of an executemany call
+        print(f"{Fore.YELLOW}Warning: only one run used --batch-writes; "
+              f"INSERT/UPDATE/DELETE are not comparable{Style.RESET_ALL}")
+    baseline = baseline_run["results"]
+    results = new_run["results"]
+
+    rows = []
+    regressions = 0
+    for engine, operations in results.items():
+        for operation, stats in operations.items():
+            old_stats = baseline.get(engine, {}).get(operation)
+            if old_stats is None or "samples_ns" not in stats or "samples_ns" not in old_stats:
+                continue
+            # The ratio uses every statement; the t-test one sample per timed span
+            new_mean = float(np.mean(stats["samples_ns"]))
+            old_mean = float(np.mean(old_stats["samples_ns"]))
+            ratio = new_mean / old_mean if old_mean > 0 else 1.0
+            p_value = welch_t_test(span_samples(stats), span_samples(old_stats))
+            regressed = ratio > args.max_ratio and p_value < args.alpha
+            regressions += regressed
+            color = Fore.RED if regressed else (Fore.GREEN if ratio < 1 else "")
+            rows.append([
+                engine,
+                operation,
+                f"{old_mean / 1e6:.3f}",
+                f"{new_mean / 1e6:.3f}",
+                f"{color}{ratio:.3f}x{Style.RESET_ALL}",
+                f"{p_value:.3g}",
+            ])
+
+    headers = ["Engine", "Operation", "Baseline Avg (ms)", "New Avg (ms)", "Ratio", "p-value"]
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+    if regressions:
+        print(f"\n{Fore.RED}{regressions} operation(s) slower than {args.max_ratio}x "
+              f"with p < {args.alpha}{Style.RESET_ALL}")
+        sys.exit(1)
+    print(f"\n{Fore.GREEN}No significant regressions{Style.RESET_ALL}")
+
+
+if __name__ == "__main__":
+    main()
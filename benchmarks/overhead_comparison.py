@@ -2,19 +2,22 @@
 """
 Comprehensive overhead comparison between pure SQLite, pgsqlite text mode, and pgsqlite binary mode.
 This benchmark measures the exact overhead introduced by the PostgreSQL protocol layer.
+pgsqlite is reached over its Unix socket; one extra binary pass over TCP shows the transport cost.
 """
 
+import functools
 import sqlite3
 import time
 import random
-import string
 import statistics
 from dataclasses import dataclass
 from typing import List, Dict, Any, Tuple, Optional
+import numpy as np
 from tabulate import tabulate
 from colorama import init, Fore, Style
 import os
 import sys
+import socket
 import subprocess
 import signal
 import threading
@@ -22,6 +25,42 @@ import threading
 # Initialize colorama
 init()
 
+# Clock for every timed span: on Linux CLOCK_MONOTONIC_RAW, which NTP cannot slew
+# (perf_counter uses CLOCK_MONOTONIC); partial() keeps the call in C
+if sys.platform.startswith("linux") and hasattr(time, "CLOCK_MONOTONIC_RAW"):
+    clock_ns = functools.partial(time.clock_gettime_ns, time.CLOCK_MONOTONIC_RAW)
+else:
+    clock_ns = time.perf_counter_ns
+
+# Column mixes for the SELECT-only schema phase. Fixed-width integers decode without
+# per-value callbacks in binary mode while TEXT needs a UTF-8 decode either way, so
+# reporting them apart shows where the binary format actually wins.
+SCHEMA_VARIANTS = [
+    {
+        "name": "narrow",
+        "columns": "a INTEGER, b INTEGER, c BIGINT",
+        "row": lambda i: (i, i * 2, i * 1_000_000_000),
+    },
+    {
+        "name": "wide",
+        "columns": "a INTEGER, b TEXT, c TEXT, d REAL, e TEXT, f BOOLEAN",
+        "row": lambda i: (i, f"name_{i}", "x" * 64, i * 0.5, f"description for row {i}", i % 2 == 0),
+    },
+]
+SCHEMA_ROWS = 100
+SCHEMA_SELECTS = 50
+
+MIXED_OPERATIONS = ["INSERT", "UPDATE", "DELETE", "SELECT"]
+# Untimed executions of each mixed statement before the plan runs, enough for
+# psycopg3 (prepare_threshold=1) to have prepared every one of them
+WARMUP_ROUNDS = 5
+# Seed for the mixed-workload plan, so every engine runs the identical operations
+PLAN_SEED = 42
+
+OPERATIONS = ["CREATE", "INSERT", "UPDATE", "DELETE", "SELECT", "SELECT (cached)"] + [
+    f"SELECT ({variant['name']})" for variant in SCHEMA_VARIANTS
+]
+
 @dataclass
 class OverheadResult:
     operation: str
@@ -31,12 +70,19 @@ class OverheadResult:
     count: int
 
 class OverheadBenchmark:
-    def __init__(self, iterations: int = 500, batch_size: int = 50, port: int = 44000):
+    def __init__(self, iterations: int = 500, batch_size: int = 50, port: int = 44000,
+                 driver_cpu: Optional[int] = None, server_cpu: Optional[int] = None, fifo: bool = False):
         self.iterations = iterations
         self.batch_size = batch_size
         self.port = port
+        # Optional CPU pinning / real-time scheduling, see pin_driver()
+        self.driver_cpu = driver_cpu
+        self.server_cpu = server_cpu
+        self.fifo = fifo
         self.sqlite_file = "overhead_benchmark.db"
         self.pgsqlite_process = None
+        # Cost of one back-to-back clock_ns pair, subtracted from every timed span
+        self.timer_overhead_ns = 0
 
         # Import drivers
         try:
@@ -48,25 +94,91 @@ class OverheadBenchmark:
             sys.exit(1)
 
         # Timing storage
-        self.sqlite_times: Dict[str, List[float]] = {
-            "CREATE": [], "INSERT": [], "UPDATE": [], "DELETE": [], "SELECT": [], "SELECT (cached)": []
-        }
-        self.pgsqlite_text_times: Dict[str, List[float]] = {
-            "CREATE": [], "INSERT": [], "UPDATE": [], "DELETE": [], "SELECT": [], "SELECT (cached)": []
-        }
-        self.pgsqlite_binary_times: Dict[str, List[float]] = {
-            "CREATE": [], "INSERT": [], "UPDATE": [], "DELETE": [], "SELECT": [], "SELECT (cached)": []
-        }
+        self.sqlite_times: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.pgsqlite_text_times: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.pgsqlite_binary_times: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.pgsqlite_pipeline_times: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.pgsqlite_tcp_times: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        # Individually timed statements from a per-statement replay, for the tail-latency table
+        self.sqlite_tail_times: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.pgsqlite_text_tail_times: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.pgsqlite_binary_tail_times: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+
+        # The mixed workload is drawn once and replayed for every engine
+        self.plan = self.build_plan()
+
+    def calibrate_timer(self, samples: int = 10_000) -> int:
+        """Median cost in ns of an empty clock_ns() start/stop pair"""
+        clock = clock_ns
+        deltas = []
+        for _ in range(samples):
+            start = clock()
+            deltas.append(clock() - start)
+        return int(statistics.median(deltas))
 
     def setup(self):
         """Setup benchmark environment"""
+        self.timer_overhead_ns = self.calibrate_timer()
+        print(f"{Fore.CYAN}Timer start/stop overhead: {self.timer_overhead_ns}ns "
+              f"(subtracted from every measurement){Style.RESET_ALL}")
+
         # Clean up any existing files
         if os.path.exists(self.sqlite_file):
             os.remove(self.sqlite_file)
 
-        # Kill any existing pgsqlite processes
-        os.system(f"pkill -f 'pgsqlite.*{self.port}' 2>/dev/null")
-        time.sleep(1)
+        # Kill any existing pgsqlite processes and wait for the port to be released
+        subprocess.run(["pkill", "-f", f"pgsqlite.*{self.port}"],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._wait_for_port(listening=False, timeout=2.0)
+
+    def pin_driver(self):
+        """Pin this process to driver_cpu and optionally switch it to SCHED_FIFO.
+
+        Keeps the driver from migrating between cores mid-run. Best results
+        come from isolating the driver and server CPUs on the kernel command
+        line (e.g. isolcpus=2,3). SCHED_FIFO needs root or CAP_SYS_NICE and is
+        inherited by the pgsqlite server started afterwards.
+        """
+        if self.driver_cpu is not None:
+            os.sched_setaffinity(0, {self.driver_cpu})
+            print(f"{Fore.CYAN}Driver pinned to CPU {self.driver_cpu}{Style.RESET_ALL}")
+        if self.fifo:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(20))
+                print(f"{Fore.CYAN}Using SCHED_FIFO priority 20{Style.RESET_ALL}")
+            except PermissionError:
+                print(f"{Fore.YELLOW}Warning: SCHED_FIFO needs root or CAP_SYS_NICE, "
+                      f"keeping the default scheduler{Style.RESET_ALL}")
+
+    def _port_open(self) -> bool:
+        """Whether something accepts TCP connections on the benchmark port"""
+        with socket.socket() as sock:
+            sock.settimeout(0.05)
+            try:
+                sock.connect(("127.0.0.1", self.port))
+                return True
+            except OSError:
+                return False
+
+    def _wait_for_port(self, listening: bool = True, timeout: float = 5.0) -> bool:
+        """Poll every 10ms until the port is (or stops) listening; False on timeout"""
+        deadline = time.monotonic() + timeout
+        while self._port_open() != listening:
+            if listening and self.pgsqlite_process and self.pgsqlite_process.poll() is not None:
+                return False
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def conninfo(self, socket_type: str = "unix") -> str:
+        """psycopg3 connection string for the benchmark's pgsqlite server.
+
+        pgsqlite always listens on /tmp/.s.PGSQL.<port> as well as TCP;
+        socket_type "unix" uses that socket, "tcp" goes through localhost.
+        """
+        host = "/tmp" if socket_type == "unix" else "localhost"
+        return f"host={host} port={self.port} dbname={self.sqlite_file} user=dummy password=dummy sslmode=disable"
 
     def start_pgsqlite_server(self):
         """Start pgsqlite server"""
@@ -75,6 +187,9 @@ class OverheadBenchmark:
             "--database", self.sqlite_file,
             "--port", str(self.port)
         ]
+        if self.server_cpu is not None:
+            # taskset applies the affinity before exec, so every server thread inherits it
+            cmd = ["taskset", "-c", str(self.server_cpu)] + cmd
 
         print(f"{Fore.CYAN}Starting pgsqlite server on port {self.port}...{Style.RESET_ALL}")
 
@@ -86,12 +201,13 @@ class OverheadBenchmark:
             cwd="/home/eran/work/pgsqlite"
         )
 
-        # Wait for server to start
-        time.sleep(3)
-
-        # Verify server is running
-        if self.pgsqlite_process.poll() is not None:
-            print(f"{Fore.RED}Error: pgsqlite server failed to start{Style.RESET_ALL}")
+        # Poll until the server accepts connections instead of sleeping a fixed 3s
+        if not self._wait_for_port(timeout=10.0):
+            if self.pgsqlite_process.poll() is not None:
+                print(f"{Fore.RED}Error: pgsqlite server failed to start{Style.RESET_ALL}")
+            else:
+                print(f"{Fore.RED}Error: pgsqlite server not accepting connections after 10s{Style.RESET_ALL}")
+                self.stop_pgsqlite_server()
             sys.exit(1)
 
         print(f"{Fore.GREEN}pgsqlite server started successfully{Style.RESET_ALL}")
@@ -103,25 +219,197 @@ class OverheadBenchmark:
             self.pgsqlite_process.wait()
             print(f"{Fore.CYAN}pgsqlite server stopped{Style.RESET_ALL}")
 
-    def random_string(self, length: int) -> str:
-        """Generate random string for testing"""
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+    def random_string(self, length: int, rng: random.Random = random) -> str:
+        """Random lowercase hex string of the given length.
+
+        One getrandbits() call formatted in C, like secrets.token_hex but
+        drawn from rng so a seeded plan stays reproducible.
+        """
+        return f"{rng.getrandbits(4 * length):0{length}x}"
 
-    def random_data(self) -> Tuple[str, int, float, bool]:
+    def random_data(self, rng: random.Random = random) -> Tuple[str, int, float, bool]:
         """Generate random test data"""
         return (
-            self.random_string(20),
-            random.randint(1, 10000),
-            random.uniform(0.0, 1000.0),
-            random.choice([True, False])
+            self.random_string(20, rng),
+            rng.randint(1, 10000),
+            rng.uniform(0.0, 1000.0),
+            rng.choice([True, False])
         )
 
+    def build_plan(self, seed: int = PLAN_SEED) -> List[Dict[str, list]]:
+        """Pre-generate the mixed workload as commit-sized rounds.
+
+        Each round maps an operation to its parameters: INSERT rows, UPDATE
+        (text, row position), SELECT (threshold,) and DELETE row positions.
+        Positions index the list of live row ids at the time the batch runs,
+        so the plan is independent of the ids each engine hands out.
+        """
+        rng = random.Random(seed)
+        plan = []
+        live_rows = 0
+        for round_start in range(0, self.iterations, self.batch_size):
+            # Draw the round's operations; with no rows to work on, fall back to INSERT
+            counts = dict.fromkeys(MIXED_OPERATIONS, 0)
+            available = live_rows
+            for _ in range(min(self.batch_size, self.iterations - round_start)):
+                operation = rng.choice(MIXED_OPERATIONS)
+                if operation != "INSERT" and not available:
+                    operation = "INSERT"
+                available += {"INSERT": 1, "DELETE": -1}.get(operation, 0)
+                counts[operation] += 1
+
+            # Batches run in this order, so UPDATE/DELETE see the round's INSERTs
+            live_rows += counts["INSERT"]
+            plan.append({
+                "INSERT": [self.random_data(rng) for _ in range(counts["INSERT"])],
+                "UPDATE": [(self.random_string(20, rng), rng.randrange(live_rows))
+                           for _ in range(counts["UPDATE"])],
+                "SELECT": [(rng.randint(1, 5000),) for _ in range(counts["SELECT"])],
+                "DELETE": rng.sample(range(live_rows), counts["DELETE"]),
+            })
+            live_rows -= counts["DELETE"]
+        return plan
+
     def measure_time(self, func, *args, **kwargs) -> float:
-        """Measure execution time of a function"""
-        start = time.perf_counter()
-        result = func(*args, **kwargs)
-        end = time.perf_counter()
-        return end - start, result
+        """Measure execution time of a function, discarding its result"""
+        pc = clock_ns
+        start = pc()
+        func(*args, **kwargs)
+        return max(pc() - start - self.timer_overhead_ns, 0) / 1e9
+
+    def time_batch(self, cursor, sql: str, params: List[tuple], fetch=None,
+                   pipeline: bool = False, results: Optional[list] = None,
+                   record: Optional[List[float]] = None, per_statement: bool = False) -> float:
+        """Execute sql once per parameter tuple inside a single timed span.
+
+        Returns the per-statement share of the elapsed time and, when record
+        is given, credits that share to every statement in it. Whatever fetch
+        (e.g. cursor.fetchone) returned for each statement is appended to
+        results when a list is given. With pipeline (psycopg3 only) the whole
+        batch is sent as one pipelined executemany, so the statements share a
+        single round trip. With per_statement each execute is timed on its
+        own and record gets the individual latencies (tail-latency pass).
+        """
+        pc = clock_ns
+        execute = cursor.execute
+        keep = results.append if results is not None else None
+        if per_statement:
+            overhead = self.timer_overhead_ns
+            latencies = []
+            for row in params:
+                start = pc()
+                execute(sql, row)
+                if fetch is not None:
+                    rows = fetch()
+                    if keep is not None:
+                        keep(rows)
+                latencies.append(max(pc() - start - overhead, 0) / 1e9)
+            if record is not None:
+                record.extend(latencies)
+            return sum(latencies) / len(latencies) if latencies else 0.0
+        start = pc()
+        if pipeline:
+            with cursor.connection.pipeline():
+                cursor.executemany(sql, params, returning=fetch is not None)
+            if fetch is not None:
+                while True:
+                    rows = fetch()
+                    if keep is not None:
+                        keep(rows)
+                    if not cursor.nextset():
+                        break
+        elif fetch is None:
+            for row in params:
+                execute(sql, row)
+        elif keep is None:
+            for row in params:
+                execute(sql, row)
+                fetch()
+        else:
+            for row in params:
+                execute(sql, row)
+                keep(fetch())
+        elapsed = pc() - start
+        if not params:
+            return 0.0
+        share = max(elapsed - self.timer_overhead_ns, 0) / 1e9 / len(params)
+        if record is not None:
+            record.extend([share] * len(params))
+        return share
+
+    def run_mixed_operations(self, conn, cursor, table: str, placeholder: str,
+                             times_dict: Dict[str, List[float]], returning: bool = False,
+                             pipeline: bool = False, per_statement: bool = False):
+        """Run the planned INSERT/UPDATE/DELETE/SELECT mix in commit-sized rounds.
+
+        Every round of self.plan runs each operation type as one homogeneous
+        batch (INSERT, UPDATE, SELECT, DELETE) timed by a single clock_ns
+        pair, with all parameters resolved beforehand. Every statement in a
+        batch is credited the batch's per-statement average, unless
+        per_statement times each one individually.
+        """
+        p = placeholder
+        insert_sql = f"INSERT INTO {table} (text_col, int_col, real_col, bool_col) VALUES ({p}, {p}, {p}, {p})"
+        if returning:
+            insert_sql += " RETURNING id"
+        update_sql = f"UPDATE {table} SET text_col = {p} WHERE id = {p}"
+        delete_sql = f"DELETE FROM {table} WHERE id = {p}"
+        select_sql = f"SELECT * FROM {table} WHERE int_col > {p}"
+
+        # Warm the connection and statement caches on throwaway rows
+        for _ in range(WARMUP_ROUNDS):
+            cursor.execute(insert_sql, ("warmup", 0, 0.0, False))
+            row_id = cursor.fetchone()[0] if returning else cursor.lastrowid
+            cursor.execute(update_sql, ("warmup", row_id))
+            cursor.execute(select_sql, (10000,))
+            cursor.fetchall()
+            cursor.execute(delete_sql, (row_id,))
+        conn.commit()
+
+        # Bound once so the round loop does no attribute or dict lookups
+        time_batch = self.time_batch
+        fetchone, fetchall = cursor.fetchone, cursor.fetchall
+        insert_times = times_dict["INSERT"]
+        update_times = times_dict["UPDATE"]
+        select_times = times_dict["SELECT"]
+        delete_times = times_dict["DELETE"]
+
+        data_ids = []
+        for planned in self.plan:
+            if planned["INSERT"]:
+                rows = planned["INSERT"]
+                inserted = []
+                time_batch(cursor, insert_sql, rows, fetchone if returning else None,
+                           pipeline, inserted, insert_times, per_statement)
+                if returning:
+                    data_ids.extend(row[0] for row in inserted)
+                else:
+                    # Rows were inserted in one go, so their ids are consecutive
+                    data_ids.extend(range(cursor.lastrowid - len(rows) + 1, cursor.lastrowid + 1))
+
+            if planned["UPDATE"]:
+                rows = [(text, data_ids[position]) for text, position in planned["UPDATE"]]
+                time_batch(cursor, update_sql, rows, None, pipeline, None, update_times, per_statement)
+
+            if planned["SELECT"]:
+                rows = planned["SELECT"]
+                time_batch(cursor, select_sql, rows, fetchall, pipeline, None, select_times, per_statement)
+
+            if planned["DELETE"]:
+                rows = [(data_ids[position],) for position in planned["DELETE"]]
+                time_batch(cursor, delete_sql, rows, None, pipeline, None, delete_times, per_statement)
+                doomed = set(planned["DELETE"])
+                data_ids = [row_id for position, row_id in enumerate(data_ids) if position not in doomed]
+
+            conn.commit()
+
+    def run_cached_queries(self, cursor, cached_queries: List[Tuple[str, tuple]],
+                           times_dict: Dict[str, List[float]], repeats: int = 20,
+                           pipeline: bool = False, per_statement: bool = False):
+        """Repeat each cached query as one timed batch of identical executes"""
+        for query, params in cached_queries:
+            self.time_batch(cursor, query, [params] * repeats, cursor.fetchall, pipeline,
+                            record=times_dict["SELECT (cached)"], per_statement=per_statement)
 
     def run_sqlite_benchmarks(self):
         """Run benchmarks using direct SQLite access"""
@@ -131,7 +419,7 @@ class OverheadBenchmark:
         cursor = conn.cursor()
 
         # CREATE TABLE
-        elapsed, _ = self.measure_time(
+        elapsed = self.measure_time(
             cursor.execute,
             """CREATE TABLE IF NOT EXISTS benchmark_table (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -144,60 +432,7 @@ class OverheadBenchmark:
         self.sqlite_times["CREATE"].append(elapsed)
         conn.commit()
 
-        # Mixed operations with timing
-        data_ids = []
-
-        for i in range(self.iterations):
-            operation = random.choice(["INSERT", "UPDATE", "DELETE", "SELECT"])
-
-            if operation == "INSERT" or (operation in ["UPDATE", "DELETE", "SELECT"] and not data_ids):
-                # INSERT
-                data = self.random_data()
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "INSERT INTO benchmark_table (text_col, int_col, real_col, bool_col) VALUES (?, ?, ?, ?)",
-                    data
-                )
-                self.sqlite_times["INSERT"].append(elapsed)
-                data_ids.append(cursor.lastrowid)
-
-            elif operation == "UPDATE" and data_ids:
-                # UPDATE
-                id_to_update = random.choice(data_ids)
-                new_text = self.random_string(20)
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "UPDATE benchmark_table SET text_col = ? WHERE id = ?",
-                    (new_text, id_to_update)
-                )
-                self.sqlite_times["UPDATE"].append(elapsed)
-
-            elif operation == "DELETE" and data_ids:
-                # DELETE
-                id_to_delete = random.choice(data_ids)
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "DELETE FROM benchmark_table WHERE id = ?",
-                    (id_to_delete,)
-                )
-                self.sqlite_times["DELETE"].append(elapsed)
-                data_ids.remove(id_to_delete)
-
-            elif operation == "SELECT" and data_ids:
-                # SELECT
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "SELECT * FROM benchmark_table WHERE int_col > ?",
-                    (random.randint(1, 5000),)
-                )
-                cursor.fetchall()  # Ensure we fetch results
-                self.sqlite_times["SELECT"].append(elapsed)
-
-            # Commit periodically
-            if i % self.batch_size == 0:
-                conn.commit()
-
-        conn.commit()
+        self.run_mixed_operations(conn, cursor, "benchmark_table", "?", self.sqlite_times)
 
         # Run cached query benchmarks
         print(f"{Fore.CYAN}🗂️  Running SQLite cached query benchmarks...{Style.RESET_ALL}")
@@ -212,36 +447,46 @@ class OverheadBenchmark:
         ]
 
         # Run each query multiple times to test caching
-        for _ in range(100):
-            query, params = random.choice(cached_queries)
-            elapsed, _ = self.measure_time(cursor.execute, query, params)
-            cursor.fetchall()
-            self.sqlite_times["SELECT (cached)"].append(elapsed)
+        self.run_cached_queries(cursor, cached_queries, self.sqlite_times)
+
+        self.run_schema_variants(conn, cursor, "sqlite", "?", self.sqlite_times)
+
+        # Replay everything with one clock pair per statement for the tail-latency table
+        self.run_mixed_operations(conn, cursor, "benchmark_table", "?", self.sqlite_tail_times,
+                                  per_statement=True)
+        self.run_cached_queries(cursor, cached_queries, self.sqlite_tail_times, per_statement=True)
+        self.run_schema_variants(conn, cursor, "sqlite", "?", self.sqlite_tail_times, per_statement=True)
 
         conn.close()
 
-    def run_pgsqlite_benchmarks(self, driver_mode: str, times_dict: Dict[str, List[float]]):
-        """Run benchmarks using pgsqlite with specified driver mode"""
-        mode_name = "text" if driver_mode == "text" else "binary"
-        print(f"{Fore.CYAN}🚀 Running pgsqlite benchmarks in {mode_name} mode...{Style.RESET_ALL}")
+    def run_pgsqlite_benchmarks(self, driver_mode: str, times_dict: Dict[str, List[float]],
+                                socket_type: str = "unix",
+                                tail_dict: Optional[Dict[str, List[float]]] = None):
+        """Run benchmarks using pgsqlite with specified driver mode.
+
+        "binary_pipeline" is the binary mode with every batch sent through
+        conn.pipeline(), i.e. one round trip per batch instead of per statement.
+        socket_type picks the Unix socket (default) or TCP over loopback.
+        With tail_dict the workload is replayed once more, timing every
+        statement on its own, for the tail-latency table.
+        """
+        pipeline = driver_mode == "binary_pipeline"
+        mode_name = {"text": "text", "binary": "binary", "binary_pipeline": "pipelined binary"}[driver_mode]
+        print(f"{Fore.CYAN}🚀 Running pgsqlite benchmarks in {mode_name} mode over {socket_type}...{Style.RESET_ALL}")
 
         # Connect using psycopg3
-        conninfo = f"host=localhost port={self.port} dbname={self.sqlite_file} user=dummy password=dummy sslmode=disable"
+        conninfo = self.conninfo(socket_type)
 
-        if driver_mode == "binary":
-            # psycopg3 binary mode
-            conn = self.psycopg.connect(conninfo)
-        else:
-            # psycopg3 text mode
-            conn = self.psycopg.connect(conninfo)
-            # Force text mode by disabling prepared statements
-            if hasattr(conn, 'prepare_threshold'):
-                conn.prepare_threshold = None
+        # Same driver and connection settings for every mode, so the text/binary gap
+        # is the wire format alone. Preparing on the second execution means the
+        # untimed warm-up leaves every benchmarked statement prepared.
+        conn = self.psycopg.connect(conninfo)
+        conn.prepare_threshold = 1
 
-        cursor = conn.cursor()
+        cursor = conn.cursor(binary=driver_mode != "text")
 
         # CREATE TABLE (only if not exists)
-        elapsed, _ = self.measure_time(
+        elapsed = self.measure_time(
             cursor.execute,
             """CREATE TABLE IF NOT EXISTS benchmark_table_pg (
                 id SERIAL PRIMARY KEY,
@@ -252,62 +497,12 @@ class OverheadBenchmark:
             )"""
         )
         times_dict["CREATE"].append(elapsed)
+        # Text and binary runs share the table; start each from the same empty state
+        cursor.execute("DELETE FROM benchmark_table_pg")
         conn.commit()
 
-        # Mixed operations with timing
-        data_ids = []
-
-        for i in range(self.iterations):
-            operation = random.choice(["INSERT", "UPDATE", "DELETE", "SELECT"])
-
-            if operation == "INSERT" or (operation in ["UPDATE", "DELETE", "SELECT"] and not data_ids):
-                # INSERT
-                data = self.random_data()
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "INSERT INTO benchmark_table_pg (text_col, int_col, real_col, bool_col) VALUES (%s, %s, %s, %s) RETURNING id",
-                    data
-                )
-                times_dict["INSERT"].append(elapsed)
-                data_ids.append(cursor.fetchone()[0])
-
-            elif operation == "UPDATE" and data_ids:
-                # UPDATE
-                id_to_update = random.choice(data_ids)
-                new_text = self.random_string(20)
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "UPDATE benchmark_table_pg SET text_col = %s WHERE id = %s",
-                    (new_text, id_to_update)
-                )
-                times_dict["UPDATE"].append(elapsed)
-
-            elif operation == "DELETE" and data_ids:
-                # DELETE
-                id_to_delete = random.choice(data_ids)
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "DELETE FROM benchmark_table_pg WHERE id = %s",
-                    (id_to_delete,)
-                )
-                times_dict["DELETE"].append(elapsed)
-                data_ids.remove(id_to_delete)
-
-            elif operation == "SELECT" and data_ids:
-                # SELECT
-                elapsed, _ = self.measure_time(
-                    cursor.execute,
-                    "SELECT * FROM benchmark_table_pg WHERE int_col > %s",
-                    (random.randint(1, 5000),)
-                )
-                cursor.fetchall()  # Ensure we fetch results
-                times_dict["SELECT"].append(elapsed)
-
-            # Commit periodically
-            if i % self.batch_size == 0:
-                conn.commit()
-
-        conn.commit()
+        self.run_mixed_operations(conn, cursor, "benchmark_table_pg", "%s", times_dict, returning=True,
+                                  pipeline=pipeline)
 
         # Run cached query benchmarks
         print(f"{Fore.CYAN}🚀 Running pgsqlite cached query benchmarks in {mode_name} mode...{Style.RESET_ALL}")
@@ -322,26 +517,56 @@ class OverheadBenchmark:
         ]
 
         # Run each query multiple times to test caching
-        for _ in range(100):
-            query, params = random.choice(cached_queries)
-            elapsed, _ = self.measure_time(cursor.execute, query, params)
-            cursor.fetchall()
-            times_dict["SELECT (cached)"].append(elapsed)
+        self.run_cached_queries(cursor, cached_queries, times_dict, pipeline=pipeline)
+
+        self.run_schema_variants(conn, cursor, "pg", "%s", times_dict, pipeline)
+
+        if tail_dict is not None:
+            self.run_mixed_operations(conn, cursor, "benchmark_table_pg", "%s", tail_dict, returning=True,
+                                      per_statement=True)
+            self.run_cached_queries(cursor, cached_queries, tail_dict, per_statement=True)
+            self.run_schema_variants(conn, cursor, "pg", "%s", tail_dict, per_statement=True)
 
         cursor.close()
         conn.close()
 
+    def run_schema_variants(self, conn, cursor, suffix: str, placeholder: str,
+                            times_dict: Dict[str, List[float]], pipeline: bool = False,
+                            per_statement: bool = False):
+        """Time full-table SELECTs on each SCHEMA_VARIANTS column mix"""
+        for variant in SCHEMA_VARIANTS:
+            table = f"schema_{variant['name']}_{suffix}"
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {variant['columns']})")
+            cursor.execute(f"DELETE FROM {table}")
+            rows = [(i,) + variant["row"](i) for i in range(SCHEMA_ROWS)]
+            cursor.executemany(
+                f"INSERT INTO {table} VALUES ({', '.join([placeholder] * len(rows[0]))})", rows)
+            conn.commit()
+
+            self.time_batch(cursor, f"SELECT * FROM {table}", [()] * SCHEMA_SELECTS, cursor.fetchall,
+                            pipeline, record=times_dict[f"SELECT ({variant['name']})"],
+                            per_statement=per_statement)
+            conn.commit()
+
     def calculate_stats(self, times: List[float]) -> Dict[str, float]:
-        """Calculate statistics for a list of times"""
+        """Calculate statistics for a list of times.
+
+        Samples are appended to plain lists while timing and only converted
+        to an array here, once per operation.
+        """
         if not times:
-            return {"avg": 0, "min": 0, "max": 0, "median": 0, "total": 0}
+            return {"avg": 0, "min": 0, "max": 0, "median": 0, "p95": 0, "p99": 0, "total": 0}
 
+        a = np.asarray(times, dtype=np.float64)
+        p50, p95, p99 = np.percentile(a, [50, 95, 99])
         return {
-            "avg": statistics.mean(times),
-            "min": min(times),
-            "max": max(times),
-            "median": statistics.median(times),
-            "total": sum(times)
+            "avg": float(a.mean()),
+            "min": float(a.min()),
+            "max": float(a.max()),
+            "median": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "total": float(a.sum())
         }
 
     def print_overhead_results(self):
@@ -350,24 +575,31 @@ class OverheadBenchmark:
         print(f"{Fore.YELLOW}PGSQLITE OVERHEAD ANALYSIS RESULTS{Style.RESET_ALL}")
         print(f"{Fore.GREEN}{'='*100}{Style.RESET_ALL}")
 
+        # Stats and text/binary/pipelined/TCP-vs-SQLite ratios for every operation,
+        # computed once and shared by the table and the breakdown below
+        stats = {
+            operation: tuple(self.calculate_stats(times[operation]) for times in
+                             (self.sqlite_times, self.pgsqlite_text_times, self.pgsqlite_binary_times,
+                              self.pgsqlite_pipeline_times, self.pgsqlite_tcp_times))
+            for operation in OPERATIONS
+        }
+        ratios = {
+            operation: tuple(engine["avg"] / sqlite["avg"] for engine in pgsqlite) if sqlite["avg"] > 0 else None
+            for operation, (sqlite, *pgsqlite) in stats.items()
+        }
+
         # Detailed comparison table
         comparison_data = []
 
-        for operation in ["CREATE", "INSERT", "UPDATE", "DELETE", "SELECT", "SELECT (cached)"]:
-            sqlite_stats = self.calculate_stats(self.sqlite_times[operation])
-            text_stats = self.calculate_stats(self.pgsqlite_text_times[operation])
-            binary_stats = self.calculate_stats(self.pgsqlite_binary_times[operation])
-
-            if sqlite_stats["avg"] > 0:
-                text_overhead = ((text_stats["avg"] - sqlite_stats["avg"]) / sqlite_stats["avg"]) * 100
-                binary_overhead = ((binary_stats["avg"] - sqlite_stats["avg"]) / sqlite_stats["avg"]) * 100
-                text_multiplier = text_stats["avg"] / sqlite_stats["avg"] if sqlite_stats["avg"] > 0 else 0
-                binary_multiplier = binary_stats["avg"] / sqlite_stats["avg"] if sqlite_stats["avg"] > 0 else 0
-            else:
-                text_overhead = 0
-                binary_overhead = 0
-                text_multiplier = 0
-                binary_multiplier = 0
+        for operation in OPERATIONS:
+            sqlite_stats, text_stats, binary_stats, pipeline_stats, tcp_stats = stats[operation]
+            text_multiplier, binary_multiplier, pipeline_multiplier, _ = ratios[operation] or (0, 0, 0, 0)
+            # Extra cost of loopback TCP over the Unix socket for the same binary pass
+            tcp_cost = (f"{(tcp_stats['avg'] / binary_stats['avg'] - 1) * 100:+.1f}%"
+                        if binary_stats["avg"] > 0 else "-")
+            # A missing SQLite baseline reports 0% rather than -100%
+            text_overhead = (text_multiplier - 1) * 100 if ratios[operation] else 0
+            binary_overhead = (binary_multiplier - 1) * 100 if ratios[operation] else 0
 
             comparison_data.append([
                 operation,
@@ -375,27 +607,47 @@ class OverheadBenchmark:
                 f"{sqlite_stats['avg']*1000:.3f}",
                 f"{text_stats['avg']*1000:.3f}",
                 f"{binary_stats['avg']*1000:.3f}",
+                f"{pipeline_stats['avg']*1000:.3f}",
+                f"{tcp_stats['avg']*1000:.3f}",
                 f"{text_multiplier:.1f}x",
                 f"{binary_multiplier:.1f}x",
+                f"{pipeline_multiplier:.1f}x",
                 f"{text_overhead:+.1f}%",
-                f"{binary_overhead:+.1f}%"
+                f"{binary_overhead:+.1f}%",
+                tcp_cost
             ])
 
         headers = [
             "Operation", "Count",
-            "SQLite (ms)", "pgsqlite Text (ms)", "pgsqlite Binary (ms)",
-            "Text Overhead", "Binary Overhead",
-            "Text %", "Binary %"
+            "SQLite (ms)", "pgsqlite Text (ms)", "pgsqlite Binary (ms)", "Pipelined (ms)", "Binary TCP (ms)",
+            "Text Overhead", "Binary Overhead", "Pipelined Overhead",
+            "Text %", "Binary %", "TCP vs Unix"
         ]
 
         print(tabulate(comparison_data, headers=headers, tablefmt="grid"))
 
+        # Tail latencies come from the per-statement replay; the batch-timed passes
+        # above credit every statement its batch average, which has no tail
+        print(f"\n{Fore.CYAN}⏱️  TAIL LATENCY (ms, per-statement replay):{Style.RESET_ALL}")
+        tail_data = [
+            [operation] + [f"{engine[key]*1000:.3f}"
+                           for engine in (self.calculate_stats(times[operation]) for times in
+                                          (self.sqlite_tail_times, self.pgsqlite_text_tail_times,
+                                           self.pgsqlite_binary_tail_times))
+                           for key in ("median", "p95", "p99")]
+            for operation in OPERATIONS[1:]
+        ]
+        tail_headers = ["Operation"] + [f"{engine} {key}" for engine in ("SQLite", "Text", "Binary")
+                                        for key in ("p50", "p95", "p99")]
+        print(tabulate(tail_data, headers=tail_headers, tablefmt="grid"))
+
         # Summary statistics
         print(f"\n{Fore.CYAN}📊 OVERHEAD SUMMARY:{Style.RESET_ALL}")
 
-        total_sqlite = sum(sum(times) for times in self.sqlite_times.values())
-        total_text = sum(sum(times) for times in self.pgsqlite_text_times.values())
-        total_binary = sum(sum(times) for times in self.pgsqlite_binary_times.values())
+        total_sqlite, total_text, total_binary, total_pipeline, total_tcp = (
+            sum(operation_stats[engine]["total"] for operation_stats in stats.values())
+            for engine in range(5)
+        )
 
         if total_sqlite > 0:
             overall_text_overhead = ((total_text - total_sqlite) / total_sqlite) * 100
@@ -403,27 +655,30 @@ class OverheadBenchmark:
 
             print(f"📈 Overall Text Mode Overhead: {overall_text_overhead:+.1f}% ({total_text/total_sqlite:.1f}x)")
             print(f"📈 Overall Binary Mode Overhead: {overall_binary_overhead:+.1f}% ({total_binary/total_sqlite:.1f}x)")
+            print(f"📈 Overall Pipelined Binary Overhead: "
+                  f"{(total_pipeline - total_sqlite) / total_sqlite * 100:+.1f}% ({total_pipeline/total_sqlite:.1f}x)")
 
             # Performance comparison between modes
             if total_text > 0:
                 binary_vs_text = ((total_binary - total_text) / total_text) * 100
                 print(f"⚡ Binary vs Text Performance: {binary_vs_text:+.1f}% ({'faster' if binary_vs_text < 0 else 'slower'})")
 
-        print(f"\n{Fore.CYAN}🎯 OPERATIONAL BREAKDOWN:{Style.RESET_ALL}")
+            # Same binary pass over both transports: the difference is the loopback TCP stack
+            if total_binary > 0:
+                print(f"🔌 Binary over TCP vs Unix socket: {(total_tcp - total_binary) / total_binary * 100:+.1f}%")
 
-        for operation in ["INSERT", "UPDATE", "DELETE", "SELECT", "SELECT (cached)"]:
-            sqlite_avg = self.calculate_stats(self.sqlite_times[operation])["avg"]
-            text_avg = self.calculate_stats(self.pgsqlite_text_times[operation])["avg"]
-            binary_avg = self.calculate_stats(self.pgsqlite_binary_times[operation])["avg"]
+        print(f"\n{Fore.CYAN}🎯 OPERATIONAL BREAKDOWN:{Style.RESET_ALL}")
 
-            if sqlite_avg > 0:
-                text_mult = text_avg / sqlite_avg
-                binary_mult = binary_avg / sqlite_avg
+        for operation in OPERATIONS[1:]:
+            if ratios[operation]:
+                text_mult, binary_mult, pipeline_mult, _ = ratios[operation]
 
                 text_color = Fore.GREEN if text_mult < 2 else Fore.YELLOW if text_mult < 5 else Fore.RED
                 binary_color = Fore.GREEN if binary_mult < 2 else Fore.YELLOW if binary_mult < 5 else Fore.RED
+                pipeline_color = Fore.GREEN if pipeline_mult < 2 else Fore.YELLOW if pipeline_mult < 5 else Fore.RED
 
-                print(f"{operation:15}: Text {text_color}{text_mult:.1f}x{Style.RESET_ALL}, Binary {binary_color}{binary_mult:.1f}x{Style.RESET_ALL}")
+                print(f"{operation:15}: Text {text_color}{text_mult:.1f}x{Style.RESET_ALL}, Binary {binary_color}{binary_mult:.1f}x{Style.RESET_ALL}, "
+                      f"Pipelined {pipeline_color}{pipeline_mult:.1f}x{Style.RESET_ALL}")
 
     def run(self):
         """Run the complete overhead benchmark suite"""
@@ -446,6 +701,9 @@ class OverheadBenchmark:
                 print(f"{Fore.RED}Failed to build pgsqlite{Style.RESET_ALL}")
                 return
 
+            # Pin after the build so cargo is not confined to the driver CPU
+            self.pin_driver()
+
             # Run pure SQLite benchmarks
             self.run_sqlite_benchmarks()
 
@@ -453,10 +711,17 @@ class OverheadBenchmark:
             self.start_pgsqlite_server()
 
             # Run pgsqlite text mode benchmarks
-            self.run_pgsqlite_benchmarks("text", self.pgsqlite_text_times)
+            self.run_pgsqlite_benchmarks("text", self.pgsqlite_text_times, tail_dict=self.pgsqlite_text_tail_times)
 
             # Run pgsqlite binary mode benchmarks
-            self.run_pgsqlite_benchmarks("binary", self.pgsqlite_binary_times)
+            self.run_pgsqlite_benchmarks("binary", self.pgsqlite_binary_times,
+                                         tail_dict=self.pgsqlite_binary_tail_times)
+
+            # Run pgsqlite binary mode again with pipelined batches
+            self.run_pgsqlite_benchmarks("binary_pipeline", self.pgsqlite_pipeline_times)
+
+            # Repeat the binary pass over TCP to split transport cost from protocol cost
+            self.run_pgsqlite_benchmarks("binary", self.pgsqlite_tcp_times, socket_type="tcp")
 
             # Print results
             self.print_overhead_results()
@@ -483,13 +748,22 @@ def main():
                         help="Batch size for commits (default: 50)")
     parser.add_argument("--port", type=int, default=44000,
                         help="PostgreSQL port to use (default: 44000)")
+    parser.add_argument("--driver-cpu", type=int,
+                        help="Pin the benchmark driver to this CPU (Linux only)")
+    parser.add_argument("--server-cpu", type=int,
+                        help="Start pgsqlite pinned to this CPU with taskset (Linux only)")
+    parser.add_argument("--fifo", action="store_true",
+                        help="Run under SCHED_FIFO (needs root); pair with isolcpus for the pinned CPUs")
 
     args = parser.parse_args()
 
     benchmark = OverheadBenchmark(
         iterations=args.iterations,
         batch_size=args.batch_size,
-        port=args.port
+        port=args.port,
+        driver_cpu=args.driver_cpu,
+        server_cpu=args.server_cpu,
+        fifo=args.fifo
     )
     benchmark.run()
 
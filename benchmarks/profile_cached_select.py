@@ -4,6 +4,7 @@ Profile cached SELECT performance to investigate regression
 """
 
 import time
+import psycopg
 import psycopg2
 import sqlite3
 import argparse
@@ -43,11 +44,11 @@ def benchmark_sqlite_cached_select(conn, iterations):
     times = []
     for i in range(iterations):
         # Use the same query to ensure caching
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         cursor.execute("SELECT * FROM cache_test WHERE value = ?", (50,))
         result = cursor.fetchall()
-        end = time.perf_counter()
-        times.append((end - start) * 1000)  # Convert to ms
+        end = time.perf_counter_ns()
+        times.append((end - start) / 1e6)  # Convert to ms
     
     return times
 
@@ -78,14 +79,56 @@ def benchmark_pgsqlite_cached_select(conn, iterations):
     times = []
     for i in range(iterations):
         # Use the same query to ensure caching
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         cursor.execute("SELECT * FROM cache_test WHERE value = %s", (50,))
         result = cursor.fetchall()
-        end = time.perf_counter()
-        times.append((end - start) * 1000)  # Convert to ms
+        end = time.perf_counter_ns()
+        times.append((end - start) / 1e6)  # Convert to ms
     
     return times
 
+def benchmark_pgsqlite_cached_select_pipelined(conn, iterations):
+    """Benchmark pgsqlite cached SELECT with every query sent in one psycopg3 pipeline
+
+    Queries overlap on the wire, so the total is roughly one round trip plus
+    pgsqlite's own processing time. Returns the average ms per query.
+    """
+    cursor = conn.cursor()
+    
+    # Reuse the serial run's table: schema changes would invalidate the statement
+    # and schema caches the rest of this profiler measures. Only create it when
+    # this connection cannot see it.
+    try:
+        cursor.execute("SELECT COUNT(*) FROM cache_test")
+        cursor.fetchall()
+    except psycopg.Error:
+        conn.rollback()
+        cursor.execute("""
+            CREATE TABLE cache_test (
+                id SERIAL PRIMARY KEY,
+                value INTEGER,
+                name TEXT
+            )
+        """)
+        cursor.executemany("INSERT INTO cache_test (value, name) VALUES (%s, %s)",
+                           [(i, f"name_{i}") for i in range(100)])
+    conn.commit()
+    
+    # Warm up cache with first query
+    cursor.execute("SELECT * FROM cache_test WHERE value = %s", (50,))
+    cursor.fetchall()
+    
+    params = [(50,)] * iterations
+    start = time.perf_counter_ns()
+    with conn.pipeline():
+        cursor.executemany("SELECT * FROM cache_test WHERE value = %s", params, returning=True)
+    cursor.fetchall()
+    while cursor.nextset():
+        cursor.fetchall()
+    end = time.perf_counter_ns()
+    
+    return (end - start) / 1e6 / iterations
+
 def profile_pgsqlite_operations(conn):
     """Profile pgsqlite operations to find bottlenecks"""
     profiler = cProfile.Profile()
@@ -159,11 +202,11 @@ def analyze_cache_behavior(conn, query_variations):
         # Measure
         times = []
         for _ in range(query_variations):
-            start = time.perf_counter()
+            start = time.perf_counter_ns()
             cursor.execute(query, params)
             cursor.fetchall()
-            end = time.perf_counter()
-            times.append((end - start) * 1000)
+            end = time.perf_counter_ns()
+            times.append((end - start) / 1e6)
         
         avg_time = mean(times)
         std_dev = stdev(times) if len(times) > 1 else 0
@@ -203,6 +246,11 @@ def main():
     pgsqlite_avg = mean(pgsqlite_times)
     pgsqlite_std = stdev(pgsqlite_times) if len(pgsqlite_times) > 1 else 0
     
+    # Same queries pipelined, so the average excludes one round trip per query
+    print(f"{Fore.YELLOW}Running pgsqlite pipelined benchmark...{Style.RESET_ALL}")
+    with psycopg.connect(host='localhost', port=args.port, dbname=':memory:', user='dummy') as pipe_conn:
+        pipelined_avg = benchmark_pgsqlite_cached_select_pipelined(pipe_conn, args.iterations)
+    
     # Performance comparison
     overhead = ((pgsqlite_avg - sqlite_avg) / sqlite_avg) * 100
     
@@ -214,6 +262,8 @@ def main():
         ["Min (ms)", f"{min(sqlite_times):.4f}", f"{min(pgsqlite_times):.4f}", ""],
         ["Max (ms)", f"{max(sqlite_times):.4f}", f"{max(pgsqlite_times):.4f}", ""],
         ["Overhead", "", "", f"{overhead:+.1f}%"],
+        ["Pipelined avg (ms)", "", f"{pipelined_avg:.4f}", f"{pipelined_avg - sqlite_avg:.4f}"],
+        ["Round trip share (ms)", "", f"{pgsqlite_avg - pipelined_avg:.4f}", ""],
     ]
     print(tabulate(comparison, headers="firstrow", tablefmt="grid"))
     
@@ -34,11 +34,12 @@ sleep 2
 # Run psycopg2 benchmark
 echo -e "\n${GREEN}Running psycopg2 benchmark...${NC}"
 cd benchmarks
-poetry run python benchmark_drivers.py --port $PORT --socket-dir /tmp --driver psycopg2 --iterations 1000 2>/dev/null | tee psycopg2_results.txt
+mkdir -p results
+poetry run python benchmark_drivers.py --port $PORT --socket-dir /tmp --driver psycopg2 --iterations 1000 --markdown results/psycopg2_latest.md 2>/dev/null | tee psycopg2_results.txt
 
 # Run psycopg3-text benchmark  
 echo -e "\n${GREEN}Running psycopg3-text benchmark...${NC}"
-poetry run python benchmark_drivers.py --port $PORT --socket-dir /tmp --driver psycopg3-text --iterations 1000 2>/dev/null | tee psycopg3_results.txt
+poetry run python benchmark_drivers.py --port $PORT --socket-dir /tmp --driver psycopg3-text --iterations 1000 --markdown results/psycopg3_latest.md 2>/dev/null | tee psycopg3_results.txt
 
 # Cleanup
 kill $PID 2>/dev/null
@@ -47,4 +48,6 @@ rm -f /tmp/.s.PGSQL.$PORT
 
 echo -e "\n${YELLOW}Results saved to:${NC}"
 echo "  - benchmarks/psycopg2_results.txt"
-echo "  - benchmarks/psycopg3_results.txt"
\ No newline at end of file
+echo "  - benchmarks/psycopg3_results.txt"
+echo "  - benchmarks/results/psycopg2_latest.md"
+echo "  - benchmarks/results/psycopg3_latest.md"
\ No newline at end of file
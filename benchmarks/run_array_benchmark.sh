@@ -64,7 +64,7 @@ if ! command -v poetry &> /dev/null; then
 fi
 
 # Install dependencies if needed
-if [[ ! -d .venv ]] || ! poetry run python -c "import psycopg, tabulate, colorama" 2>/dev/null; then
+if [[ ! -d .venv ]] || ! poetry run python -c "import psycopg, tabulate, colorama, numpy" 2>/dev/null; then
     echo "📦 Installing Python dependencies with Poetry..."
     poetry install
 fi
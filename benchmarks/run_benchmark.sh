@@ -82,27 +82,50 @@ else
     echo -e "${YELLOW}Using psycopg2 (default)${NC}"
 fi
 
+# Optional CPU pinning for steadier numbers, e.g. PGSQLITE_CPU=2 CLIENT_CPU=3
+SERVER_PIN=()
+CLIENT_PIN=()
+if command -v taskset &> /dev/null; then
+    if [ -n "$PGSQLITE_CPU" ]; then
+        SERVER_PIN=(taskset -c "$PGSQLITE_CPU")
+        echo -e "${YELLOW}Pinning pgsqlite to CPU $PGSQLITE_CPU${NC}"
+    fi
+    if [ -n "$CLIENT_CPU" ]; then
+        CLIENT_PIN=(taskset -c "$CLIENT_CPU")
+        echo -e "${YELLOW}Pinning benchmark client to CPU $CLIENT_CPU${NC}"
+    fi
+fi
+
 # Check if --file-based flag was passed to use file-based mode
 if [[ "$@" == *"--file-based"* ]]; then
     echo -e "${YELLOW}Starting pgsqlite with file-based database${NC}"
     if [ -n "$SOCKET_DIR" ]; then
-        ./target/release/pgsqlite -p $PGSQLITE_PORT -d benchmark_test.db --socket-dir $SOCKET_DIR &
+        "${SERVER_PIN[@]}" ./target/release/pgsqlite -p $PGSQLITE_PORT -d benchmark_test.db --socket-dir $SOCKET_DIR &
     else
-        ./target/release/pgsqlite -p $PGSQLITE_PORT -d benchmark_test.db &
+        "${SERVER_PIN[@]}" ./target/release/pgsqlite -p $PGSQLITE_PORT -d benchmark_test.db &
     fi
     PGSQLITE_PID=$!
 else
     echo -e "${YELLOW}Starting pgsqlite with in-memory database (default)${NC}"
     if [ -n "$SOCKET_DIR" ]; then
-        ./target/release/pgsqlite -p $PGSQLITE_PORT --in-memory --socket-dir $SOCKET_DIR &
+        "${SERVER_PIN[@]}" ./target/release/pgsqlite -p $PGSQLITE_PORT --in-memory --socket-dir $SOCKET_DIR &
     else
-        ./target/release/pgsqlite -p $PGSQLITE_PORT --in-memory &
+        "${SERVER_PIN[@]}" ./target/release/pgsqlite -p $PGSQLITE_PORT --in-memory &
     fi
     PGSQLITE_PID=$!
 fi
 
-# Give the server time to start
-sleep 2
+# Poll until the server accepts connections instead of sleeping a fixed 2s
+for i in {1..50}; do
+    if [ -n "$SOCKET_DIR" ] && [ -S "$SOCKET_DIR/.s.PGSQL.$PGSQLITE_PORT" ]; then
+        break
+    fi
+    if [ -z "$SOCKET_DIR" ] && nc -z localhost $PGSQLITE_PORT 2>/dev/null; then
+        break
+    fi
+    kill -0 $PGSQLITE_PID 2>/dev/null || break
+    sleep 0.1
+done
 
 # Check if server is running
 if ! kill -0 $PGSQLITE_PID 2>/dev/null; then
@@ -118,9 +141,9 @@ cd benchmarks
 
 # Run the benchmark with Poetry, passing the port, driver, and socket dir if applicable
 if [ -n "$SOCKET_DIR" ]; then
-    poetry run python benchmark.py --port $PGSQLITE_PORT --socket-dir $SOCKET_DIR --driver $DRIVER "$@"
+    "${CLIENT_PIN[@]}" poetry run python benchmark.py --port $PGSQLITE_PORT --socket-dir $SOCKET_DIR --driver $DRIVER "$@"
 else
-    poetry run python benchmark.py --port $PGSQLITE_PORT --driver $DRIVER "$@"
+    "${CLIENT_PIN[@]}" poetry run python benchmark.py --port $PGSQLITE_PORT --driver $DRIVER "$@"
 fi
 
 # Cleanup
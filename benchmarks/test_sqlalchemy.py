@@ -98,9 +98,9 @@ class TestRunner:
         """Run a single test and record results"""
         print(f"\n{Fore.CYAN}Running: {test_name}{Style.RESET_ALL}")
         try:
-            start = time.perf_counter()
+            start = time.perf_counter_ns()
             result = test_func()
-            elapsed = (time.perf_counter() - start) * 1000
+            elapsed = (time.perf_counter_ns() - start) / 1e6
             self.results.append((test_name, "PASS", elapsed, None))
             print(f"  {Fore.GREEN}✓ PASS{Style.RESET_ALL} ({elapsed:.2f}ms)")
             return True
@@ -0,0 +1,83 @@
+#!/bin/bash
+set -e
+
+# Run the SQLite, pgsqlite text and pgsqlite binary overhead scripts.
+# Requires a pgsqlite server on port 45000 (see benchmarks/README.md), unless
+# --backend is given, in which case one is started on the matching store.
+#
+# Usage: ./run_overhead_tests.sh [--parallel] [--per-statement] [--tcp] [--backend mem|tmpfs|disk]
+#   --parallel       overlap the three runs to cut wall time; the default
+#                    sequential mode gives fairer head-to-head latencies
+#   --per-statement  passed through; every script times each INSERT/SELECT
+#                    on its own instead of batching the INSERT phase
+#   --tcp            passed through; connect over localhost TCP instead of
+#                    the server's Unix socket in /tmp
+#   --backend        put SQLite and a freshly started pgsqlite (release build)
+#                    on the same store: in memory, /dev/shm or the working dir
+#                    (each side gets its own database file there)
+
+cd "$(dirname "$0")"
+
+scripts=("test_sqlite.py" "test_pgsqlite_text.py" "test_pgsqlite_binary.py")
+
+parallel=false
+backend=""
+args=()
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --parallel) parallel=true ;;
+        --backend)
+            backend="$2"
+            args+=("$1" "$2")
+            shift
+            ;;
+        *) args+=("$1") ;;
+    esac
+    shift
+done
+
+if [ -n "$backend" ]; then
+    case "$backend" in
+        mem) db_args=(--in-memory) ;;
+        tmpfs) db_args=(--database /dev/shm/test_overhead.db) ;;
+        disk) db_args=(--database test_overhead.db) ;;
+        *) echo "--backend must be one of: mem, tmpfs, disk" >&2; exit 1 ;;
+    esac
+    echo "Backend: $backend"
+    # A socket left by an earlier server would satisfy the wait below immediately
+    rm -f /tmp/.s.PGSQL.45000
+    ./target/release/pgsqlite --port 45000 "${db_args[@]}" >/dev/null 2>&1 &
+    server_pid=$!
+    trap 'kill $server_pid 2>/dev/null || true' EXIT
+    # Wait for the Unix socket rather than a fixed sleep
+    for i in {1..50}; do
+        [ -S /tmp/.s.PGSQL.45000 ] && break
+        kill -0 $server_pid 2>/dev/null || { echo "Failed to start pgsqlite" >&2; exit 1; }
+        sleep 0.1
+    done
+    if [ ! -S /tmp/.s.PGSQL.45000 ] || ! kill -0 $server_pid 2>/dev/null; then
+        echo "pgsqlite did not create /tmp/.s.PGSQL.45000 within 5s" >&2
+        exit 1
+    fi
+fi
+
+if [ "$parallel" = true ]; then
+    # Buffer each script's output so the reports don't interleave
+    outdir=$(mktemp -d)
+    trap 'rm -rf "$outdir"; [ -n "$server_pid" ] && kill $server_pid 2>/dev/null || true' EXIT
+    pids=()
+    for script in "${scripts[@]}"; do
+        python3 "$script" "${args[@]}" > "$outdir/$script.log" 2>&1 &
+        pids+=($!)
+    done
+    status=0
+    for i in "${!scripts[@]}"; do
+        wait "${pids[$i]}" || status=1
+        cat "$outdir/${scripts[$i]}.log"
+    done
+    exit $status
+fi
+
+for script in "${scripts[@]}"; do
+    python3 "$script" "${args[@]}"
+done
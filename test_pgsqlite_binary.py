@@ -1,22 +1,55 @@
 #!/usr/bin/env python3
+import sys
+
 import psycopg
-import time
+
+from _overhead_driver import (INSERT_PARAMS, NAMES, SELECT_PARAMS, VALUES, bulk_insert_ms, check_transport,
+                              clock_ns, latency_ms, pgsqlite_conninfo, round_trip_floor_ms, run_phase,
+                              run_phase_pipelined, warm_up)
+
+# Default to batched phases; --per-statement keeps one round trip per execute
+PER_STATEMENT = "--per-statement" in sys.argv
 
 # Test pgsqlite binary mode performance
-conn = psycopg.connect("host=localhost port=45000 dbname=test_overhead.db user=dummy password=dummy sslmode=disable")
-# Binary mode (default for psycopg3)
-cursor = conn.cursor()
+conn = psycopg.connect(pgsqlite_conninfo(sys.argv))
+check_transport(conn, sys.argv)
+# Binary results need a binary cursor; create it once and reuse it for every phase
+cursor = conn.cursor(binary=True)
+run = run_phase if PER_STATEMENT else run_phase_pipelined
 
-start = time.perf_counter()
+warm_up(cursor)
+# SQLite cannot EXPLAIN ANALYZE, so estimate the protocol share from a no-op round trip
+floor_ms = round_trip_floor_ms(cursor)
+start = clock_ns()
 cursor.execute("CREATE TABLE IF NOT EXISTS test_pg_bin (id SERIAL PRIMARY KEY, name TEXT, value INTEGER)")
-for i in range(100):
-    cursor.execute("INSERT INTO test_pg_bin (name, value) VALUES (%s, %s) RETURNING id", (f"item{i}", i))
-    cursor.fetchone()
-for i in range(100):
-    cursor.execute("SELECT * FROM test_pg_bin WHERE value > %s", (i // 2,))
-    rows = cursor.fetchall()
+insert = latency_ms(run(cursor, "INSERT INTO test_pg_bin (name, value) VALUES (%s, %s) RETURNING id",
+                        INSERT_PARAMS, do_fetch=True))
+select = latency_ms(run(cursor, "SELECT * FROM test_pg_bin WHERE value > %s", SELECT_PARAMS, do_fetch=True))
+# Point lookups: per-row latency through a prepared statement, then the same rows in one
+# round trip, streamed off the cursor (pgsqlite has no DECLARE, so no server-side cursor)
+cursor.execute("SELECT id FROM test_pg_bin ORDER BY id DESC LIMIT 100")
+ids = [row[0] for row in cursor.fetchall()]
+lookup = latency_ms(run_phase(cursor, "SELECT * FROM test_pg_bin WHERE id = %s",
+                              [(id_,) for id_ in ids], do_fetch=True, prepare=True))
+range_ms = latency_ms(run_phase(cursor, "SELECT * FROM test_pg_bin WHERE id BETWEEN %s AND %s",
+                                [(ids[-1], ids[0])], do_fetch=True, stream=True))[0] / len(ids)
+# pgsqlite has no COPY, so the bulk-load path is a single multi-row INSERT
+bulk_ms = bulk_insert_ms(cursor, "test_pg_bin", NAMES, VALUES)
+# Every phase runs in one transaction (no autocommit); the single commit is
+# counted in the total time but not in the per-op figures
 conn.commit()
-end = time.perf_counter()
+end = clock_ns()
+cursor.close()
 
-print(f"pgsqlite binary mode total time: {(end-start)*1000:.3f}ms")
-conn.close()
\ No newline at end of file
+print(f"pgsqlite binary mode total time: {(end-start)/1e6:.3f}ms")
+print(f"  INSERT: {insert[0]:.3f}ms/op, SELECT: {select[0]:.3f}ms/op, bulk INSERT: {bulk_ms:.3f}ms/row")
+if PER_STATEMENT:
+    print(f"  INSERT p50/p99: {insert[1]:.3f}/{insert[2]:.3f}ms, SELECT p50/p99: {select[1]:.3f}/{select[2]:.3f}ms")
+else:
+    # Pipelined phases give every op the same share, so they have no distribution
+    print("  INSERT/SELECT p50/p99: n/a (pipelined batches; use --per-statement)")
+print(f"  SELECT by id: {lookup[0]:.3f}ms/op prepared (p50 {lookup[1]:.3f}, p99 {lookup[2]:.3f}), "
+      f"{range_ms:.3f}ms/row batched")
+print(f"  Round trip floor (SELECT 1): {floor_ms:.3f}ms, "
+      f"SELECT by id above floor: {lookup[1] - floor_ms:.3f}ms (p50)")
+conn.close()
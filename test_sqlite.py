@@ -1,20 +1,55 @@
 #!/usr/bin/env python3
 import sqlite3
-import time
+import sys
+
+import numpy as np
+
+from _overhead_driver import BACKENDS, INSERT_PARAMS, SELECT_PARAMS, clock_ns, latency_ms, run_phase, sqlite_backend, warm_up
+
+# Same switch as the pgsqlite scripts: INSERTs are batched unless --per-statement
+PER_STATEMENT = "--per-statement" in sys.argv
 
 # Test pure SQLite performance
-conn = sqlite3.connect("test_overhead.db")
+backend = sqlite_backend(sys.argv)
+conn = sqlite3.connect(BACKENDS[backend])
+if backend != "disk":
+    # Nothing here survives a reboot anyway; drop fsync and the rollback journal file
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA journal_mode=MEMORY")
+else:
+    # Same settings pgsqlite opens its database with, so the on-disk baseline
+    # pays WAL commits rather than a rollback-journal fsync per transaction
+    for pragma in ("journal_mode=WAL", "synchronous=NORMAL", "temp_store=MEMORY",
+                   "cache_size=-64000", "mmap_size=268435456"):
+        conn.execute(f"PRAGMA {pragma}")
 cursor = conn.cursor()
 
-start = time.perf_counter()
-cursor.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT, value INTEGER)")
-for i in range(100):
-    cursor.execute("INSERT INTO test (name, value) VALUES (?, ?)", (f"item{i}", i))
-for i in range(100):
-    cursor.execute("SELECT * FROM test WHERE value > ?", (i // 2,))
-    rows = cursor.fetchall()
+warm_up(cursor)
+start = clock_ns()
+cursor.execute("CREATE TABLE IF NOT EXISTS test (id INTEGER PRIMARY KEY, name TEXT, value INTEGER)")
+if PER_STATEMENT:
+    insert = latency_ms(run_phase(cursor, "INSERT INTO test (name, value) VALUES (?, ?)", INSERT_PARAMS))
+else:
+    # executemany is SQLite's counterpart of the pipelined pgsqlite INSERT phase;
+    # each op gets an equal share of the batch, as run_phase_pipelined does
+    insert_start = clock_ns()
+    cursor.executemany("INSERT INTO test (name, value) VALUES (?, ?)", INSERT_PARAMS)
+    insert = latency_ms(np.full(len(INSERT_PARAMS), (clock_ns() - insert_start) // len(INSERT_PARAMS),
+                                dtype=np.int64))
+# sqlite3 only allows DML in executemany, so SELECTs always run one statement at a time
+select = latency_ms(run_phase(cursor, "SELECT * FROM test WHERE value > ?", SELECT_PARAMS, do_fetch=True))
+# Every phase runs in one transaction (no autocommit); the single commit is
+# counted in the total time but not in the per-op figures
 conn.commit()
-end = time.perf_counter()
+end = clock_ns()
 
-print(f"SQLite total time: {(end-start)*1000:.3f}ms")
-conn.close()
\ No newline at end of file
+print(f"SQLite ({backend}) total time: {(end-start)/1e6:.3f}ms")
+insert_mode = "per statement" if PER_STATEMENT else "batched executemany"
+print(f"  INSERT: {insert[0]:.3f}ms/op ({insert_mode}), SELECT: {select[0]:.3f}ms/op (per statement)")
+if PER_STATEMENT:
+    print(f"  INSERT p50/p99: {insert[1]:.3f}/{insert[2]:.3f}ms, SELECT p50/p99: {select[1]:.3f}/{select[2]:.3f}ms")
+else:
+    # The batched INSERT gives every op the same share, so it has no distribution
+    print(f"  INSERT p50/p99: n/a (batched; use --per-statement), "
+          f"SELECT p50/p99: {select[1]:.3f}/{select[2]:.3f}ms")
+conn.close()